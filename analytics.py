@@ -0,0 +1,99 @@
+"""
+练习数据分析：读取 attempt_log 记录的作答日志，用 pandas 向量化统计
+每道题与每种题型的错误率、错得最多的题目以及按天的变化趋势，并写出报告。
+
+报告按扩展名选择格式：.xlsx 为多个工作表（包含全部题目的统计），其他为 Markdown 文本。
+"""
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from attempt_log import AttemptLog
+
+DEFAULT_TOP = 20
+# 进入“错得最多”榜单所需的最少作答次数
+DEFAULT_MIN_ATTEMPTS = 2
+
+
+def load_attempts(log_dir):
+    """
+    读取作答日志，返回 (每次作答一行的 DataFrame, 以题目编号为索引的题目表 DataFrame)。
+    """
+    columns, questions = AttemptLog(log_dir).read()
+    attempts = pd.DataFrame(columns, copy=False)
+    question_table = pd.DataFrame(questions, columns=["key", "type", "stem"])
+    question_table.index.name = "question"
+    return attempts, question_table
+
+
+def compute_analytics(attempts, question_table, top=DEFAULT_TOP, min_attempts=DEFAULT_MIN_ATTEMPTS):
+    """计算各项统计，返回 {名称: DataFrame}。"""
+    wrong = 1 - attempts["correct"].to_numpy(dtype=np.int64)
+    # 题型通过题目编号整体映射，不逐行查表
+    type_codes, type_names = pd.factorize(question_table["type"])
+    attempts = attempts.assign(
+        wrong=wrong,
+        type=pd.Categorical.from_codes(type_codes[attempts["question"].to_numpy()], type_names),
+    )
+
+    per_question = attempts.groupby("question", sort=False).agg(
+        attempts=("wrong", "size"), errors=("wrong", "sum"), last_seen=("time", "max"))
+    per_question["error_rate"] = per_question["errors"] / per_question["attempts"]
+    per_question = per_question.join(question_table[["type", "stem"]])
+    per_question["last_seen"] = pd.to_datetime(per_question["last_seen"] + time.localtime().tm_gmtoff, unit="s")
+    per_question = per_question.sort_values(["errors", "error_rate"], ascending=False)
+
+    per_type = attempts.groupby("type", observed=True).agg(attempts=("wrong", "size"), errors=("wrong", "sum"))
+    per_type["error_rate"] = per_type["errors"] / per_type["attempts"]
+
+    most_missed = per_question[per_question["attempts"] >= min_attempts].head(top)
+
+    # 按本地日期统计每天的作答量与错误率，并给出 7 天滚动错误率
+    day = pd.to_datetime(attempts["time"] + time.localtime().tm_gmtoff, unit="s").dt.floor("D")
+    trend = attempts.groupby(day.rename("date")).agg(attempts=("wrong", "size"), errors=("wrong", "sum"))
+    trend["error_rate"] = trend["errors"] / trend["attempts"]
+    rolling = trend[["attempts", "errors"]].rolling(7, min_periods=1).sum()
+    trend["error_rate_7d"] = rolling["errors"] / rolling["attempts"]
+
+    overview = pd.DataFrame({
+        "value": pd.Series([len(attempts), len(per_question), int(attempts["wrong"].sum()),
+                            float(attempts["wrong"].mean()) if len(attempts) else 0.0], dtype=object)
+    })
+    overview.index = ["作答次数", "涉及题目", "答错次数", "总体错误率"]
+    return {
+        "概览": overview,
+        "题型统计": per_type,
+        "错题排行": most_missed,
+        "每日趋势": trend,
+        "题目统计": per_question,
+    }
+
+
+def _markdown_section(title, frame):
+    return f"## {title}\n\n```\n{frame.to_string()}\n```\n"
+
+
+def write_report(results, output_filename):
+    """写出报告；.xlsx 包含全部题目的统计，Markdown 只包含排行等摘要。"""
+    if os.path.splitext(output_filename)[1].lower() == ".xlsx":
+        with pd.ExcelWriter(output_filename, engine="openpyxl") as writer:
+            for name, frame in results.items():
+                frame.to_excel(writer, sheet_name=name)
+        return
+    formatted = {}
+    for name, frame in results.items():
+        frame = frame.copy()
+        for column in ("error_rate", "error_rate_7d"):
+            if column in frame:
+                frame[column] = frame[column].map("{:.1%}".format)
+        if name == "概览":
+            frame.loc["总体错误率", "value"] = f"{frame.loc['总体错误率', 'value']:.1%}"
+        if "stem" in frame:
+            frame["stem"] = frame["stem"].str.slice(0, 40)
+        formatted[name] = frame
+    sections = [_markdown_section(name, frame)
+                for name, frame in formatted.items() if name != "题目统计"]
+    with open(output_filename, "w", encoding="utf-8") as f:
+        f.write("# 练习分析报告\n\n" + "\n".join(sections))
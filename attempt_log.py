@@ -0,0 +1,129 @@
+"""
+测验作答日志。
+
+每次提交测验时，把每道题的作答追加到题库旁的 <题库文件>.attempts/ 目录中。日志按列存储，
+每列是一个只追加的定长二进制文件（小端序）：
+
+- question.u32   题目编号（指向 questions.jsonl 的行号）
+- chosen.u32     所选选项的位掩码（第 i 位为 1 表示选了第 i 个选项）
+- correct.u8     是否答对
+- time.i64       作答时间（Unix 时间戳，秒）
+
+questions.jsonl 每行记录一道题的 {"key", "type", "stem"}，键为归一化题干，与练习记录相同；
+同一道题只记录一次。写入只需标准库；读取时用 numpy 直接映射各列，百万级记录也能瞬间载入。
+若写入中途被打断导致各列长度不一，下次追加前会先把各列截断到共同的行数（题目表去掉不完整的
+最后一行），保证之后的记录仍然逐行对齐；读取时同样只取共同的行数。
+"""
+import json
+import os
+import sys
+from array import array
+
+ATTEMPTS_SUFFIX = ".attempts"
+QUESTIONS_NAME = "questions.jsonl"
+# 列名 -> (文件名, array 类型码, numpy dtype)
+COLUMNS = {
+    "question": ("question.u32", "I", "<u4"),
+    "chosen": ("chosen.u32", "I", "<u4"),
+    "correct": ("correct.u8", "B", "u1"),
+    "time": ("time.i64", "q", "<i8"),
+}
+
+
+def attempts_path(db_filename):
+    return db_filename + ATTEMPTS_SUFFIX
+
+
+def _load_questions(directory):
+    path = os.path.join(directory, QUESTIONS_NAME)
+    questions = []
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    questions.append(json.loads(line))
+    return questions
+
+
+class AttemptLog:
+    """只追加的按列作答日志。"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._ids = None  # 题目键 -> 编号，首次追加时加载
+
+    def _repair(self):
+        """把被中断的写入留下的残缺部分截掉：各列截断到共同的完整行数，题目表去掉半行。"""
+        files = []
+        for filename, code, _ in COLUMNS.values():
+            path = os.path.join(self.directory, filename)
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            files.append((path, size, array(code).itemsize))
+        rows = min(size // itemsize for _, size, itemsize in files)
+        for path, size, itemsize in files:
+            if size != rows * itemsize:
+                os.truncate(path, rows * itemsize)
+
+        path = os.path.join(self.directory, QUESTIONS_NAME)
+        if os.path.exists(path) and os.path.getsize(path):
+            with open(path, 'rb+') as f:
+                data = f.read()
+                if not data.endswith(b'\n'):
+                    f.truncate(data.rfind(b'\n') + 1)
+
+    def append(self, attempts):
+        """
+        追加一批作答记录。
+
+        :param attempts: 可迭代的 (题目键, 题型, 题干, 所选位掩码, 是否答对, 时间戳)
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        if self._ids is None:
+            self._repair()
+            self._ids = {q['key']: i for i, q in enumerate(_load_questions(self.directory))}
+
+        columns = {name: array(code) for name, (_, code, _) in COLUMNS.items()}
+        new_questions = []
+        for key, q_type, stem, chosen_mask, correct, timestamp in attempts:
+            question_id = self._ids.get(key)
+            if question_id is None:
+                question_id = self._ids[key] = len(self._ids)
+                new_questions.append({"key": key, "type": q_type, "stem": stem})
+            columns["question"].append(question_id)
+            columns["chosen"].append(chosen_mask)
+            columns["correct"].append(bool(correct))
+            columns["time"].append(int(timestamp))
+
+        try:
+            # 先写题目表，保证日志中的编号总能找到对应的题目
+            if new_questions:
+                with open(os.path.join(self.directory, QUESTIONS_NAME), 'a', encoding='utf-8') as f:
+                    f.writelines(json.dumps(q, ensure_ascii=False) + '\n' for q in new_questions)
+            for name, (filename, _, _) in COLUMNS.items():
+                column = columns[name]
+                if sys.byteorder == 'big':
+                    column.byteswap()
+                with open(os.path.join(self.directory, filename), 'ab') as f:
+                    column.tofile(f)
+        except BaseException:
+            # 写入失败时丢弃内存中的编号表，下次追加前重新修复并加载
+            self._ids = None
+            raise
+        return len(columns["question"])
+
+    def read(self):
+        """
+        读取整个日志，返回 ({列名: numpy 数组}, 题目表)。日志不存在时返回空数组。
+        """
+        import numpy as np
+
+        arrays = {}
+        for name, (filename, _, dtype) in COLUMNS.items():
+            path = os.path.join(self.directory, filename)
+            if os.path.exists(path) and os.path.getsize(path):
+                arrays[name] = np.fromfile(path, dtype=dtype)
+            else:
+                arrays[name] = np.empty(0, dtype=dtype)
+        length = min(len(column) for column in arrays.values())
+        return {name: column[:length] for name, column in arrays.items()}, _load_questions(self.directory)
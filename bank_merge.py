@@ -0,0 +1,98 @@
+"""
+多个题库文件的合并模块。
+
+各文件在进程池中并行加载并计算归一化题干与选项签名，随后按归一化题干做一次线性合并：
+同一道题以最先出现的版本为准，若不同来源的选项集合或正确答案不一致则记录为冲突。
+"""
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from bank_store import open_bank
+from normalize import normalize_stems
+
+
+def _option_signatures(questions):
+    """返回每道题的 (归一化选项集合, 归一化正确选项集合)，与选项顺序无关。"""
+    texts = normalize_stems([text for q in questions for text, _ in q['options']])
+    signatures = []
+    pos = 0
+    for q in questions:
+        count = len(q['options'])
+        normalized = texts[pos:pos + count]
+        pos += count
+        options = frozenset(normalized)
+        correct = frozenset(text for text, (_, is_correct) in zip(normalized, q['options']) if is_correct)
+        signatures.append((options, correct))
+    return signatures
+
+
+def load_for_merge(path):
+    """
+    加载一个题库文件并预先计算合并所需的键，供进程池调用。
+
+    返回 (文件路径, 题目列表, 归一化题干列表, 选项签名列表)。
+    """
+    store = open_bank(path)
+    try:
+        # .xqb 返回的 CompiledBank 持有 mmap，无法从子进程传回，先解码为普通列表
+        questions = list(store.load())
+    finally:
+        store.close()
+    keys = normalize_stems([q['stem'] for q in questions])
+    return path, questions, keys, _option_signatures(questions)
+
+
+def merge_banks(paths, workers=None, on_error=print):
+    """
+    合并多个题库文件。
+
+    返回 (合并后的题目列表, 冲突列表, 每个文件贡献的新题数量字典)。
+    每个冲突为 {"stem", "kind", "versions": [{"file", "options"}, ...]}，
+    kind 为 "options"（选项集合不同）或 "answer"（选项相同但正确答案不同）。
+    """
+    workers = workers or min(len(paths), os.cpu_count() or 1)
+    loaded = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [(path, executor.submit(load_for_merge, path)) for path in paths]
+        for path, future in futures:
+            try:
+                loaded.append(future.result())
+            except FileNotFoundError:
+                on_error(f"题库 '{path}' 不存在，已跳过。")
+            except Exception as e:
+                on_error(f"题库 '{path}' 加载失败: {e}")
+
+    merged = []
+    first_seen = {}   # 归一化题干 -> (合并结果中的下标, 来源文件, 选项签名)
+    conflicts = {}    # 归一化题干 -> 冲突记录
+    contributed = {}
+    for path, questions, keys, signatures in loaded:
+        contributed[path] = 0
+        for question, key, signature in zip(questions, keys, signatures):
+            seen = first_seen.get(key)
+            if seen is None:
+                first_seen[key] = (len(merged), path, signature)
+                merged.append(question)
+                contributed[path] += 1
+                continue
+            index, first_path, first_signature = seen
+            if signature == first_signature:
+                continue
+            kind = "options" if signature[0] != first_signature[0] else "answer"
+            conflict = conflicts.get(key)
+            if conflict is None:
+                conflict = conflicts[key] = {
+                    "stem": merged[index]['stem'],
+                    "kind": kind,
+                    "versions": [{"file": first_path, "options": merged[index]['options']}],
+                }
+            elif kind == "options":
+                conflict["kind"] = kind
+            conflict["versions"].append({"file": path, "options": question['options']})
+    return merged, list(conflicts.values()), contributed
+
+
+def write_conflict_report(conflicts, report_filename):
+    with open(report_filename, 'w', encoding='utf-8') as f:
+        json.dump(conflicts, f, ensure_ascii=False, indent=4)
@@ -0,0 +1,453 @@
+"""
+题库存储后端。
+
+根据文件扩展名选择存储方式，所有后端都以题干(stem)为键：
+- .json            兼容原有的 题库.json 格式，整体写入（先写临时文件再原子替换）
+- .jsonl           追加写日志，每次保存只追加变更的题目，定期压缩
+- .sqlite/.db      SQLite 数据库，按题干增量 upsert，事务提交
+- .xqb             编译后的二进制题库，mmap 打开并按需解码，适合只读场景；
+                   JSON 仍是源数据，可通过 convert_bank 双向转换
+"""
+import json
+import mmap
+import os
+import stat
+import struct
+import tempfile
+import weakref
+from collections.abc import Sequence
+
+
+class BankFormatError(ValueError):
+    """题库文件存在但无法解析。"""
+
+
+def _atomic_write_text(path, write, binary=False):
+    """
+    在目标目录中写临时文件，完成后用 os.replace 原子替换，避免中途中断损坏题库。
+
+    mkstemp 创建的文件权限为 0600，替换前改为原文件的权限（新文件则按 umask 取默认权限）。
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=os.path.basename(path), dir=directory)
+    try:
+        os.chmod(tmp_path, mode)
+        with (os.fdopen(fd, 'wb') if binary else os.fdopen(fd, 'w', encoding='utf-8')) as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _normalize_item(item):
+    """统一题目字典的结构，选项保存为 [文本, 是否正确] 列表。"""
+    return {
+        "type": item["type"],
+        "stem": item["stem"],
+        "options": [[text, bool(is_correct)] for text, is_correct in item["options"]],
+    }
+
+
+class JsonBankStore:
+    """原有的单文件JSON题库。"""
+
+    def __init__(self, path):
+        self.path = path
+        self._questions = None
+
+    def load(self):
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(self.path)
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._questions = json.load(f)
+        except json.JSONDecodeError as e:
+            raise BankFormatError(f"题库文件 '{self.path}' 格式错误: {e}") from e
+        return list(self._questions)
+
+    def upsert(self, items):
+        if self._questions is None:
+            try:
+                self.load()
+            except FileNotFoundError:
+                self._questions = []
+        index = {q['stem']: i for i, q in enumerate(self._questions)}
+        for item in items:
+            item = _normalize_item(item)
+            if item['stem'] in index:
+                self._questions[index[item['stem']]] = item
+            else:
+                index[item['stem']] = len(self._questions)
+                self._questions.append(item)
+        self.replace_all(self._questions)
+
+    def replace_all(self, items):
+        self._questions = [_normalize_item(item) for item in items]
+        _atomic_write_text(self.path, lambda f: json.dump(self._questions, f, ensure_ascii=False, indent=4))
+
+    def close(self):
+        pass
+
+
+class JsonlBankStore:
+    """
+    追加写的JSONL题库：每行一道题，同一题干以最后一次写入为准。
+
+    失效行超过有效题目数量时自动压缩为每题一行。
+    """
+    COMPACT_MIN_LINES = 1000
+
+    def __init__(self, path):
+        self.path = path
+        self._questions = None
+        self._line_count = 0
+        self._torn_at = None  # 末尾半行的起始位置
+
+    def load(self):
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(self.path)
+        questions = {}
+        line_count = 0
+        self._torn_at = None
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        lines = data.split(b'\n')
+        for lineno, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except ValueError as e:
+                # 最后一行可能是写入中断留下的半行（可能截断在多字节字符中间），读取时忽略，
+                # 追加前再截掉
+                if lineno == len(lines):
+                    self._torn_at = len(data) - len(line)
+                    break
+                raise BankFormatError(f"题库文件 '{self.path}' 第 {lineno} 行格式错误: {e}") from e
+            questions[item['stem']] = item
+            line_count += 1
+        self._questions = questions
+        self._line_count = line_count
+        return list(questions.values())
+
+    def _ensure_loaded(self):
+        if self._questions is None:
+            try:
+                self.load()
+            except FileNotFoundError:
+                self._questions = {}
+                self._line_count = 0
+
+    def _prepare_tail(self):
+        """追加前整理文件末尾：截掉写入中断留下的半行，给缺少换行的最后一行补上换行。"""
+        if self._torn_at is not None:
+            os.truncate(self.path, self._torn_at)
+            self._torn_at = None
+        if not os.path.exists(self.path) or not os.path.getsize(self.path):
+            return
+        with open(self.path, 'rb+') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                f.write(b'\n')
+
+    def upsert(self, items):
+        self._ensure_loaded()
+        items = [_normalize_item(item) for item in items]
+        if not items:
+            return
+        self._prepare_tail()
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for item in items:
+                f.write(json.dumps(item, ensure_ascii=False) + '\n')
+                self._questions[item['stem']] = item
+            f.flush()
+            os.fsync(f.fileno())
+        self._line_count += len(items)
+        if self._line_count > max(self.COMPACT_MIN_LINES, 2 * len(self._questions)):
+            self.compact()
+
+    def compact(self):
+        self._ensure_loaded()
+        self.replace_all(list(self._questions.values()))
+
+    def replace_all(self, items):
+        items = [_normalize_item(item) for item in items]
+        _atomic_write_text(self.path, lambda f: f.writelines(
+            json.dumps(item, ensure_ascii=False) + '\n' for item in items))
+        self._questions = {item['stem']: item for item in items}
+        self._line_count = len(self._questions)
+        self._torn_at = None
+
+    def close(self):
+        pass
+
+
+class SqliteBankStore:
+    """SQLite题库，按题干做增量 upsert。"""
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+
+    def _connect(self):
+        import sqlite3
+
+        if self._conn is None:
+            try:
+                self._conn = sqlite3.connect(self.path)
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS questions ("
+                    " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                    " stem TEXT NOT NULL UNIQUE,"
+                    " type TEXT NOT NULL,"
+                    " options TEXT NOT NULL)"
+                )
+            except sqlite3.DatabaseError as e:
+                raise BankFormatError(f"题库文件 '{self.path}' 不是有效的SQLite数据库: {e}") from e
+        return self._conn
+
+    def load(self):
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(self.path)
+        rows = self._connect().execute("SELECT type, stem, options FROM questions ORDER BY id")
+        return [{"type": q_type, "stem": stem, "options": json.loads(options)}
+                for q_type, stem, options in rows]
+
+    @staticmethod
+    def _upsert_rows(conn, items):
+        conn.executemany(
+            "INSERT INTO questions (stem, type, options) VALUES (?, ?, ?)"
+            " ON CONFLICT(stem) DO UPDATE SET type = excluded.type, options = excluded.options",
+            ((item['stem'], item['type'], json.dumps(item['options'], ensure_ascii=False))
+             for item in map(_normalize_item, items))
+        )
+
+    def upsert(self, items):
+        conn = self._connect()
+        with conn:
+            self._upsert_rows(conn, items)
+
+    def replace_all(self, items):
+        # 删除与写入在同一事务中，中途失败时回滚，不会留下空题库
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM questions")
+            self._upsert_rows(conn, items)
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+# --- 编译后的二进制题库 (.xqb) ---
+# 文件布局（小端）：
+#   头部      magic, 版本, 题目数 N, 字符串数 S, 选项引用数 R
+#   题目记录  N 条 (题型字符串号, 题干字符串号, 首个选项引用位置, 选项数, 正确答案位掩码)
+#   选项引用  R 个 uint32 字符串号
+#   字符串偏移 S+1 个 uint64，指向字符串区
+#   字符串区  去重后的 UTF-8 文本
+COMPILED_MAGIC = b"XQB\x01"
+COMPILED_VERSION = 1
+_HEADER = struct.Struct("<4sIIII")
+_RECORD = struct.Struct("<IIIII")
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+_OFFSET_PAIR = struct.Struct("<QQ")
+
+
+def write_compiled_bank(path, questions):
+    """把题目编译为 .xqb 二进制文件，相同的文本（题型、常见选项）只存一份。"""
+    string_ids = {}
+    offsets = [0]
+    blob = bytearray()
+
+    def intern(text):
+        string_id = string_ids.get(text)
+        if string_id is None:
+            string_id = string_ids[text] = len(offsets) - 1
+            blob.extend(text.encode('utf-8'))
+            offsets.append(len(blob))
+        return string_id
+
+    records = bytearray()
+    option_refs = []
+    count = 0
+    for q in questions:
+        answer_mask = 0
+        for i, (_, is_correct) in enumerate(q['options']):
+            if is_correct:
+                answer_mask |= 1 << i
+        records += _RECORD.pack(intern(q['type']), intern(q['stem']), len(option_refs),
+                                len(q['options']), answer_mask)
+        option_refs.extend(intern(text) for text, _ in q['options'])
+        count += 1
+
+    def write(f):
+        f.write(_HEADER.pack(COMPILED_MAGIC, COMPILED_VERSION, count, len(offsets) - 1, len(option_refs)))
+        f.write(records)
+        f.write(struct.pack(f"<{len(option_refs)}I", *option_refs))
+        f.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+        f.write(blob)
+    _atomic_write_text(path, write, binary=True)
+    return count
+
+
+class CompiledBank(Sequence):
+    """
+    mmap 打开的只读题库，按下标访问时才解码对应题目。
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            try:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                raise BankFormatError(f"题库文件 '{path}' 为空: {e}") from e
+        if len(self._mm) < _HEADER.size:
+            raise BankFormatError(f"题库文件 '{path}' 不是有效的 .xqb 文件")
+        magic, version, count, string_count, ref_count = _HEADER.unpack_from(self._mm, 0)
+        if magic != COMPILED_MAGIC or version != COMPILED_VERSION:
+            raise BankFormatError(f"题库文件 '{path}' 不是有效的 .xqb 文件")
+        self._count = count
+        self._records_base = _HEADER.size
+        self._refs_base = self._records_base + count * _RECORD.size
+        self._offsets_base = self._refs_base + ref_count * _U32.size
+        self._blob_base = self._offsets_base + (string_count + 1) * 8
+        # 各区的大小都由头部推算，文件被截断或头部损坏时在这里报错，而不是在之后解码时
+        if self._blob_base > len(self._mm) or \
+                self._blob_base + _U64.unpack_from(self._mm, self._blob_base - 8)[0] != len(self._mm):
+            self._mm.close()
+            raise BankFormatError(f"题库文件 '{path}' 已损坏（文件长度与头部记录的不符）")
+        self._strings = {}
+
+    def release(self):
+        """把映射的内容复制到内存并关闭映射，之后仍可正常访问；用于替换题库文件之前。"""
+        if isinstance(self._mm, mmap.mmap):
+            data = self._mm[:]
+            self._mm.close()
+            self._mm = data
+
+    def _string(self, string_id):
+        text = self._strings.get(string_id)
+        if text is None:
+            start, end = _OFFSET_PAIR.unpack_from(self._mm, self._offsets_base + string_id * 8)
+            text = self._mm[self._blob_base + start:self._blob_base + end].decode('utf-8')
+            # 只缓存短文本（题型、常见选项），避免缓存逐渐变成整个题库
+            if end - start <= 16:
+                self._strings[string_id] = text
+        return text
+
+    def record(self, index):
+        """返回原始记录 (题型字符串号, 题干字符串号, 首个选项引用位置, 选项数, 正确答案位掩码)。"""
+        return _RECORD.unpack_from(self._mm, self._records_base + index * _RECORD.size)
+
+    def stem(self, index):
+        """只解码题干，不解码选项。"""
+        return self._string(self.record(index)[1])
+
+    def question_type(self, index):
+        """只解码题型。"""
+        return self._string(self.record(index)[0])
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("题目下标越界")
+        type_id, stem_id, ref_start, option_count, answer_mask = self.record(index)
+        refs_offset = self._refs_base + ref_start * _U32.size
+        option_ids = struct.unpack_from(f"<{option_count}I", self._mm, refs_offset)
+        return {
+            "type": self._string(type_id),
+            "stem": self._string(stem_id),
+            "options": [[self._string(string_id), bool(answer_mask >> i & 1)]
+                        for i, string_id in enumerate(option_ids)],
+        }
+
+
+class CompiledBankStore:
+    """
+    .xqb 二进制题库：加载时只映射文件，不解析题目。
+
+    写入时会整体重新编译（先写临时文件再原子替换）。Windows 上无法替换仍被映射的文件，
+    因此替换前先让本存储返回过的所有 CompiledBank 释放映射（内容复制到内存，仍可继续访问）。
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._bank = None
+        self._mapped = weakref.WeakSet()  # 返回过的、可能仍在使用的 CompiledBank
+
+    def load(self):
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(self.path)
+        self._bank = CompiledBank(self.path)
+        self._mapped.add(self._bank)
+        return self._bank
+
+    def upsert(self, items):
+        if self._bank is None:
+            try:
+                self.load()
+            except FileNotFoundError:
+                pass
+        questions = {}
+        if self._bank is not None:
+            for i in range(len(self._bank)):
+                question = self._bank[i]
+                questions[question['stem']] = question
+        for item in items:
+            questions[item['stem']] = _normalize_item(item)
+        self.replace_all(questions.values())
+
+    def replace_all(self, items):
+        for bank in list(self._mapped):
+            bank.release()
+        self._mapped.clear()
+        write_compiled_bank(self.path, items)
+        self._bank = None
+
+    def close(self):
+        # 已返回的 CompiledBank 仍持有映射，由其自身在回收时释放
+        self._bank = None
+        self._mapped.clear()
+
+
+def open_bank(path):
+    """根据扩展名打开对应的题库存储。"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.xqb':
+        return CompiledBankStore(path)
+    if ext == '.jsonl':
+        return JsonlBankStore(path)
+    if ext in ('.sqlite', '.sqlite3', '.db'):
+        return SqliteBankStore(path)
+    return JsonBankStore(path)
+
+
+def convert_bank(src_path, dst_path):
+    """在不同格式的题库之间转换（例如 题库.json 与 题库.sqlite 互相导入导出），返回题目数量。"""
+    src, dst = open_bank(src_path), open_bank(dst_path)
+    try:
+        questions = src.load()
+        dst.replace_all(questions)
+    finally:
+        src.close()
+        dst.close()
+    return len(questions)
@@ -0,0 +1,114 @@
+"""
+离线模式的启动开销检查。
+
+用 `python -X importtime` 运行 main.py 的各个离线模式（使用临时的小题库），
+统计导入模块的总耗时，并确认没有加载该模式用不到的重型依赖（如 selenium）。
+模式本身必需的依赖（如导出 xlsx 所需的 openpyxl）单独列出，不计入预算。
+任一模式超出预算或加载了禁止的模块时以非零状态退出，可在提交前或 CI 中运行：
+
+    python benchmarks/check_startup.py
+    python benchmarks/check_startup.py --budget-ms 300
+
+测试套件中的 tests/test_startup.py 复用这里的模式表，以更宽松的预算做同样的检查。
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BROWSER_MODULES = ("selenium", "webdriver_manager")
+DEFAULT_BUDGET_MS = 150
+
+SAMPLE_BANK = [
+    {"type": "单选题", "stem": "示例题目()是正确的。", "options": [["甲", True], ["乙", False]]},
+    {"type": "多选题", "stem": "以下属于示例的有()。", "options": [["甲", True], ["乙", True], ["丙", False]]},
+]
+
+# (模式名称, 命令行参数, 必需的依赖, 不允许加载的模块)；{db} {tmp} 会被替换为临时路径
+MODES = [
+    ("help", ["--help"], (), BROWSER_MODULES + ("pandas", "numpy", "openpyxl", "tqdm")),
+    ("export-csv", ["--db", "{db}", "--export-excel", "{tmp}/out.csv"], ("tqdm",),
+     BROWSER_MODULES + ("pandas", "numpy", "openpyxl")),
+    ("export-xlsx", ["--db", "{db}", "--export-excel", "{tmp}/out.xlsx"], ("tqdm", "openpyxl"),
+     BROWSER_MODULES + ("pandas",)),
+    ("search", ["--db", "{db}", "--search", "示例"], ("numpy",), BROWSER_MODULES + ("pandas", "openpyxl", "tqdm")),
+    ("dedupe", ["--db", "{db}", "--dedupe"], ("numpy",), BROWSER_MODULES + ("pandas", "openpyxl", "tqdm")),
+    ("convert", ["--db", "{db}", "--convert-to", "{tmp}/bank.sqlite"], (),
+     BROWSER_MODULES + ("pandas", "numpy", "openpyxl", "tqdm")),
+    ("build-shards", ["--db", "{db}", "--build-shards", "{tmp}/shards"], (),
+     BROWSER_MODULES + ("pandas", "numpy", "openpyxl", "tqdm")),
+]
+
+
+def parse_importtime(stderr):
+    """
+    解析 -X importtime 的输出，返回 (顶层导入的累计总耗时(微秒), {模块名: 累计耗时(微秒)})。
+    """
+    total_us = 0
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue  # 表头
+        modules[name.strip()] = int(cumulative)
+        if not name.startswith("  "):
+            total_us += int(cumulative)
+    return total_us, modules
+
+
+def run_mode(args, tmp_dir, db_path):
+    argv = [a.format(db=db_path, tmp=tmp_dir) for a in args]
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", os.path.join(REPO_ROOT, "main.py"), *argv],
+        cwd=tmp_dir, capture_output=True, text=True, encoding="utf-8", errors="replace",
+        env={**os.environ, "PYTHONPATH": REPO_ROOT},
+    )
+    return result.returncode, parse_importtime(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="检查 main.py 离线模式的导入耗时。")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help=f"每个模式允许的导入总耗时(毫秒)。(默认: {DEFAULT_BUDGET_MS})")
+    parser.add_argument("--repeat", type=int, default=3, help="每个模式运行的次数，取最小值。(默认: 3)")
+    args = parser.parse_args()
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "bank.json")
+        with open(db_path, "w", encoding="utf-8") as f:
+            json.dump(SAMPLE_BANK, f, ensure_ascii=False)
+
+        print(f"{'模式':<14}{'导入耗时(ms)':>14}{'必需依赖(ms)':>14}  结果")
+        for name, mode_args, required, forbidden in MODES:
+            best_us, required_us, modules, returncode = None, 0, {}, 0
+            for _ in range(args.repeat):
+                returncode, (total_us, modules) = run_mode(mode_args, tmp_dir, db_path)
+                needed = sum(modules.get(m, 0) for m in required)
+                own = total_us - needed
+                if best_us is None or own < best_us:
+                    best_us, required_us = own, needed
+            loaded = sorted(m for m in forbidden if m in modules)
+            problems = []
+            if returncode != 0:
+                problems.append(f"退出码 {returncode}")
+            if best_us / 1000 > args.budget_ms:
+                problems.append("超出预算")
+            if loaded:
+                problems.append("加载了 " + ", ".join(loaded))
+            failures += bool(problems)
+            print(f"{name:<14}{best_us / 1000:>14.1f}{required_us / 1000:>14.1f}  {'; '.join(problems) or 'OK'}")
+
+    if failures:
+        print(f"\n{failures} 个模式未通过启动检查。")
+        sys.exit(1)
+    print("\n所有离线模式均在启动预算内。")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+题库各项操作的基准测试。
+
+用 synthetic_bank.py 生成指定规模的合成题库，分别计时：
+- 各存储格式（.json / .jsonl / .sqlite / .xqb）按 main.py 的方式打开，以及打开后首次按题干查找；
+- 选项2的合并去重（merge_into_bank）与整库重复检查；
+- export_to_excel 导出 xlsx / csv；
+- 离线解析题目页面（由合成题目渲染的 HTML 测试页面）；
+- 测验抽题（均匀抽样与按复习权重抽样）。
+
+每项取多次运行的最小值，结果连同提交号、Python 版本写入 JSON 文件；
+用 --compare 指定之前的结果文件即可对比，变慢超过容差时以非零状态退出：
+
+    python benchmarks/run_benchmarks.py --sizes 10000 100000 -o bench-new.json
+    python benchmarks/run_benchmarks.py --sizes 10000 --compare bench-old.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from bank_store import open_bank  # noqa: E402
+from synthetic_bank import generate_bank, render_question_page  # noqa: E402
+
+# 离线解析基准最多使用的题目数，以及每个测试页面包含的题目数
+HTML_QUESTIONS = 5000
+QUESTIONS_PER_PAGE = 50
+QUIZ_SIZE = 100
+
+
+@contextlib.contextmanager
+def _quiet():
+    """屏蔽被测函数的打印输出和进度条。"""
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        yield
+
+
+# 每个基准是一个 setup(ctx) 函数，准备好数据后返回真正计时的无参函数（setup 本身不计时）
+
+def _load(ext, lookup=False):
+    """
+    与 main.py 启动时相同的打开方式：store.load() 后构造 QuestionBank。
+
+    lookup 为 True 时再按题干查找一道题，计入构建题干索引的开销（选项3、合并时的路径）。
+    """
+    def setup(ctx):
+        from question_model import QuestionBank
+
+        path = os.path.join(ctx['tmp_dir'], f"bank{ext}")
+        if not os.path.exists(path):
+            store = open_bank(path)
+            store.replace_all(ctx['questions'])
+            store.close()
+        stem = ctx['questions'][len(ctx['questions']) // 2]['stem']
+
+        def run():
+            store = open_bank(path)
+            try:
+                bank = QuestionBank.from_dicts(store.load())
+                if lookup:
+                    bank.get(stem)
+            finally:
+                store.close()
+        return run
+    return setup
+
+
+def bench_merge(ctx):
+    """已有一半题目的题库再合并另一半，其中混入 10% 重复题。"""
+    from main import merge_into_bank
+    from question_model import QuestionBank
+
+    questions = ctx['questions']
+    half = len(questions) // 2
+    incoming = questions[half:] + questions[:half // 10]
+
+    def run():
+        bank = QuestionBank.from_dicts(questions[:half])
+        with _quiet():
+            merge_into_bank(bank, incoming)
+    return run
+
+
+def bench_dedupe(ctx):
+    from dedup import find_duplicate_clusters
+
+    stems = [q['stem'] for q in ctx['questions']]
+    return lambda: find_duplicate_clusters(stems)
+
+
+def _export(ext):
+    def setup(ctx):
+        from main import export_to_excel
+
+        path = os.path.join(ctx['tmp_dir'], f"export.{ext}")
+
+        def run():
+            with _quiet():
+                export_to_excel(ctx['bank'], path)
+        return run
+    return setup
+
+
+def bench_parse_html(ctx):
+    from page_parser import parse_html_file
+
+    sample = ctx['questions'][:HTML_QUESTIONS]
+    page_dir = os.path.join(ctx['tmp_dir'], "pages")
+    os.makedirs(page_dir, exist_ok=True)
+    paths = []
+    for start in range(0, len(sample), QUESTIONS_PER_PAGE):
+        path = os.path.join(page_dir, f"page{start // QUESTIONS_PER_PAGE:05d}.html")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(render_question_page(sample[start:start + QUESTIONS_PER_PAGE]))
+        paths.append(path)
+    ctx['html_questions'] = len(sample)
+
+    def run():
+        for path in paths:
+            parse_html_file(path)
+    return run
+
+
+def bench_quiz_uniform(ctx):
+    from question_model import Question
+
+    questions = ctx['questions']
+    rng = random.Random(0)
+    return lambda: [Question.from_dict(questions[i]) for i in rng.sample(range(len(questions)), QUIZ_SIZE)]
+
+
+def bench_sampler_build(ctx):
+    from practice import NEW_WEIGHT, WeightedSampler
+
+    weights = [NEW_WEIGHT] * len(ctx['questions'])
+    return lambda: WeightedSampler(weights)
+
+
+def bench_quiz_weighted(ctx):
+    from practice import WeightedSampler
+
+    rng = random.Random(0)
+    sampler = WeightedSampler([rng.random() + 0.1 for _ in ctx['questions']])
+    return lambda: sampler.sample(QUIZ_SIZE, rng)
+
+
+BENCHMARKS = [
+    ("load-json", _load(".json")),
+    ("load-jsonl", _load(".jsonl")),
+    ("load-sqlite", _load(".sqlite")),
+    ("load-xqb", _load(".xqb")),
+    ("lookup-json", _load(".json", lookup=True)),
+    ("lookup-xqb", _load(".xqb", lookup=True)),
+    ("merge", bench_merge),
+    ("dedupe", bench_dedupe),
+    ("export-xlsx", _export("xlsx")),
+    ("export-csv", _export("csv")),
+    ("parse-html", bench_parse_html),
+    ("quiz-uniform", bench_quiz_uniform),
+    ("sampler-build", bench_sampler_build),
+    ("quiz-weighted", bench_quiz_weighted),
+]
+
+
+def _git_commit():
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                                capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(sizes, selected, repeat, seed):
+    from question_model import QuestionBank
+
+    results = []
+    for size in sizes:
+        print(f"\n生成 {size} 道题目的合成题库...")
+        questions = generate_bank(size, seed)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            ctx = {'tmp_dir': tmp_dir, 'questions': questions, 'bank': QuestionBank.from_dicts(questions)}
+            for name, setup in BENCHMARKS:
+                if selected and name not in selected:
+                    continue
+                try:
+                    run = setup(ctx)
+                    best = None
+                    for _ in range(repeat):
+                        start = time.perf_counter()
+                        run()
+                        elapsed = time.perf_counter() - start
+                        best = elapsed if best is None else min(best, elapsed)
+                except ImportError as e:
+                    print(f"  {name:<16}跳过（缺少依赖: {e.name}）")
+                    continue
+                entry = {"size": size, "benchmark": name, "seconds": round(best, 6)}
+                if name == "parse-html":
+                    entry["questions"] = ctx['html_questions']
+                results.append(entry)
+                print(f"  {name:<16}{best * 1000:>12.1f} ms")
+    return results
+
+
+def compare(results, baseline_path, tolerance):
+    """与之前的结果对比，返回变慢超过容差的项数。"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    old = {(r['size'], r['benchmark']): r['seconds'] for r in baseline['results']}
+    print(f"\n与 '{baseline_path}'（提交 {baseline.get('commit')}）对比:")
+    regressions = 0
+    for r in results:
+        before = old.get((r['size'], r['benchmark']))
+        if not before:
+            continue
+        ratio = r['seconds'] / before
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag = "  <-- 变慢"
+            regressions += 1
+        print(f"  {r['size']:>8} {r['benchmark']:<16}{before * 1000:>10.1f} -> {r['seconds'] * 1000:>10.1f} ms"
+              f"  x{ratio:.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="题库各项操作的基准测试。")
+    parser.add_argument("--sizes", type=int, nargs='+', default=[10000, 100000],
+                        help="合成题库的规模，可指定多个。(默认: 10000 100000)")
+    parser.add_argument("--only", nargs='+', choices=[name for name, _ in BENCHMARKS], metavar="NAME",
+                        help="只运行指定的基准: " + ", ".join(name for name, _ in BENCHMARKS))
+    parser.add_argument("--repeat", type=int, default=3, help="每项运行的次数，取最小值。(默认: 3)")
+    parser.add_argument("--seed", type=int, default=0, help="合成题库的随机种子。(默认: 0)")
+    parser.add_argument("-o", "--output", default="benchmark-results.json",
+                        help="结果文件。(默认: benchmark-results.json)")
+    parser.add_argument("--compare", metavar="BASELINE.json", help="与之前的结果文件对比。")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="对比时允许的变慢比例。(默认: 0.2，即 20%%)")
+    args = parser.parse_args()
+
+    results = run_suite(args.sizes, set(args.only or ()), args.repeat, args.seed)
+    report = {
+        "commit": _git_commit(),
+        "timestamp": int(time.time()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n结果已写入 '{args.output}'。")
+
+    if args.compare and compare(results, args.compare, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+生成用于基准测试的合成题库。
+
+题目由常见的中文政治理论词汇随机拼接而成，单选题/多选题混合，选项数 2~6 个不等；
+一部分题目是已有题目的变体（空白、全角/半角括号、标点不同），用于检验去重逻辑。
+同样的参数与随机种子总是生成相同的题库，便于在不同提交之间比较。
+
+    python benchmarks/synthetic_bank.py 100000 -o synthetic.json
+    python benchmarks/synthetic_bank.py 1000000 -o synthetic.xqb --seed 7
+"""
+import argparse
+import html
+import os
+import random
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from page_parser import LETTERS  # noqa: E402
+
+SUBJECTS = [
+    "中国特色社会主义", "新发展理念", "全过程人民民主", "社会治理", "生态文明建设", "乡村振兴战略",
+    "共同富裕", "高质量发展", "人类命运共同体", "全面从严治党", "依法治国", "科技自立自强",
+    "马克思主义基本原理", "社会主义核心价值观", "国家安全体系", "文化自信", "党的领导",
+    "人民代表大会制度", "统一战线", "改革开放", "新型城镇化", "区域协调发展", "民族团结进步",
+]
+PREDICATES = [
+    "的本质要求是", "的根本目的在于", "的重要内容包括", "必须坚持", "的核心是", "的基本方略是",
+    "的首要任务是", "的根本保证是", "的战略目标是", "的关键在于", "的显著优势体现在",
+]
+PHRASES = [
+    "以人民为中心", "创新协调绿色开放共享", "共建共治共享", "实事求是", "解放思想", "与时俱进",
+    "统筹发展和安全", "坚持系统观念", "坚持问题导向", "守正创新", "自我革命", "群众路线",
+    "独立自主", "和平发展", "公平正义", "法治保障", "科技支撑", "民主协商", "社会协同",
+    "公众参与", "绿水青山就是金山银山", "全体人民共同富裕", "满足人民日益增长的美好生活需要",
+    "推动构建新型国际关系", "加强基层治理", "深化供给侧结构性改革", "扩大高水平对外开放",
+    "实现中华民族伟大复兴", "提高党的执政能力", "完善社会主义市场经济体制",
+]
+BLANKS = ["(\xa0\xa0 )", "（　　）", "( )", "____"]
+
+
+def _stem(rng, serial):
+    subject = rng.choice(SUBJECTS)
+    predicate = rng.choice(PREDICATES)
+    detail = "、".join(rng.sample(PHRASES, rng.randint(1, 3)))
+    # 题号保证题干互不相同
+    return f"第{serial}题：{subject}{predicate}{rng.choice(BLANKS)}，这要求我们{detail}。"
+
+
+def _variant(stem, rng):
+    """题干的“同题不同写法”：空白、括号与句末标点不同。"""
+    variant = stem
+    for blank in BLANKS:
+        variant = variant.replace(blank, rng.choice(BLANKS))
+    variant = variant.replace("，", ", ") if rng.random() < 0.5 else " " + variant
+    return variant.replace("。", ".")
+
+
+def generate_question(rng, serial):
+    q_type = "多选题" if rng.random() < 0.5 else "单选题"
+    option_count = rng.randint(2, 6) if q_type == "多选题" else rng.randint(2, 4)
+    options = [phrase + ("" if rng.random() < 0.7 else "的要求") for phrase in rng.sample(PHRASES, option_count)]
+    if q_type == "单选题":
+        correct = {rng.randrange(option_count)}
+    else:
+        correct = set(rng.sample(range(option_count), rng.randint(2, option_count)))
+    return {
+        "type": q_type,
+        "stem": _stem(rng, serial),
+        "options": [[text, i in correct] for i, text in enumerate(options)],
+    }
+
+
+def generate_bank(count, seed=0, variant_ratio=0.02):
+    """
+    生成 count 道题目（题库文件格式的字典列表）。
+
+    :param variant_ratio: 作为已有题目写法变体的比例，用于去重基准
+    """
+    rng = random.Random(seed)
+    questions = []
+    for serial in range(count):
+        if questions and rng.random() < variant_ratio:
+            original = questions[rng.randrange(len(questions))]
+            questions.append({**original, "stem": _variant(original["stem"], rng)})
+        else:
+            questions.append(generate_question(rng, serial))
+    return questions
+
+
+def render_question_page(questions):
+    """把题目渲染为与学习通作答记录页面结构相同的 HTML，用作离线解析的测试页面。"""
+    parts = ['<html><head><meta charset="utf-8"><title>作业详情</title></head><body><div class="mark_table">']
+    for number, question in enumerate(questions, 1):
+        answer = "".join(LETTERS[i] for i, (_, ok) in enumerate(question["options"]) if ok)
+        parts.append(
+            f'<div class="questionLi singleQuesId" data="{number}">'
+            f'<h3 class="mark_name colorDeep">{number}. <span class="colorShallow">({question["type"]})</span> '
+            f'{html.escape(question["stem"])}</h3><div class="stem_answer">'
+        )
+        for i, (text, _) in enumerate(question["options"]):
+            parts.append(
+                f'<div class="clearfix answerBg"><span class="num_option">{LETTERS[i]}</span>'
+                f'<div class="fl answer_p"><p>{html.escape(text)}</p></div></div>'
+            )
+        parts.append(
+            '</div><div class="mark_answer"><div class="mark_key clearfix">'
+            f'<span class="colorDeep marginRight40 fl">我的答案: {answer}</span>'
+            f'<span class="colorGreen marginRight40 fl">正确答案: {answer}</span></div></div></div>'
+        )
+    parts.append('</div></body></html>')
+    return "".join(parts)
+
+
+def main():
+    from bank_store import open_bank
+
+    parser = argparse.ArgumentParser(description="生成用于基准测试的合成题库。")
+    parser.add_argument("count", type=int, help="题目数量，例如 10000 ~ 1000000。")
+    parser.add_argument("-o", "--output", default="synthetic.json",
+                        help="输出的题库文件，按扩展名选择存储格式。(默认: synthetic.json)")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子。(默认: 0)")
+    parser.add_argument("--variant-ratio", type=float, default=0.02,
+                        help="作为已有题目写法变体的比例。(默认: 0.02)")
+    args = parser.parse_args()
+
+    questions = generate_bank(args.count, args.seed, args.variant_ratio)
+    store = open_bank(args.output)
+    try:
+        store.replace_all(questions)
+    finally:
+        store.close()
+    print(f"已生成 {len(questions)} 道题目到 '{args.output}'。")
+
+
+if __name__ == "__main__":
+    main()
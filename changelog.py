@@ -0,0 +1,152 @@
+"""
+题目的稳定编号与变更日志，用于增量（delta）导出和应用补丁。
+
+- 编号：归一化题干的 SHA-1 前 16 位，与题库去重使用的键一致，只由内容决定，
+  不同机器上同一道题得到相同的编号，与题库中的顺序、空白和标点写法无关；
+- 指纹：在编号的基础上再加入题型、排序后的归一化选项文本及各选项是否正确，
+  用于判断题目是否被修改（例如更正答案或改写选项），修改后编号不变。
+
+变更日志保存在题库旁的 <题库文件>.changes.jsonl 中，每行记录一次新增或修改：
+{"seq": 序号, "time": 时间戳, "id": 编号, "op": "add"|"modify", "fp": 指纹}。
+增量导出只需取 seq 大于（或时间晚于）某个值的编号，导出量与变更数成正比。
+题库目前没有删除操作，因此日志也不记录删除。只依赖标准库。
+"""
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+
+from bank_store import BankFormatError
+from normalize import normalize_stems
+
+CHANGES_SUFFIX = ".changes.jsonl"
+DELTA_FORMAT = "xxt-bank-delta"
+DELTA_VERSION = 1
+
+
+def changes_path(db_filename):
+    return db_filename + CHANGES_SUFFIX
+
+
+def question_signatures(questions):
+    """
+    批量计算 Question 的 (编号, 指纹)。题干与选项文本各自整体归一化一次。
+    """
+    stems = normalize_stems([q.stem for q in questions])
+    option_texts = normalize_stems([text for q in questions for text in q.options])
+    signatures = []
+    pos = 0
+    for question, stem in zip(questions, stems):
+        count = len(question.options)
+        options = sorted(zip(option_texts[pos:pos + count], (question.is_correct(i) for i in range(count))))
+        pos += count
+        qid = hashlib.sha1(stem.encode('utf-8')).hexdigest()[:16]
+        content = '\0'.join([qid, question.type, *(('1' if correct else '0') + text for text, correct in options)])
+        fingerprint = hashlib.sha1(content.encode('utf-8')).hexdigest()[:16]
+        signatures.append((qid, fingerprint))
+    return signatures
+
+
+def parse_since(text):
+    """
+    解析 --since 参数：整数为变更序号，否则按日期时间解析（如 2024-05-01 或 2024-05-01T08:00），
+    返回 ("seq", 序号) 或 ("time", 时间戳)。
+    """
+    text = text.strip()
+    if text.isdigit():
+        return "seq", int(text)
+    try:
+        return "time", datetime.fromisoformat(text).timestamp()
+    except ValueError:
+        raise ValueError(f"无法识别的 --since 值 '{text}'，请使用变更序号或日期（如 2024-05-01）。")
+
+
+class ChangeLog:
+    """只追加的题目变更日志。"""
+
+    def __init__(self, path):
+        self.path = path
+        self._state = None  # 编号 -> 最新指纹
+        self._entries = []
+        self._torn_at = None  # 末尾半行的起始位置
+        self.head_seq = 0
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def load(self):
+        if self._state is not None:
+            return
+        self._state = {}
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        lines = data.split(b'\n')
+        for lineno, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError as e:
+                # 最后一行可能是写入中断留下的半行，读取时忽略，追加前再截掉；
+                # 中间的行损坏说明日志本身有问题，不能当作历史的结尾
+                if lineno == len(lines):
+                    self._torn_at = len(data) - len(line)
+                    break
+                raise BankFormatError(f"变更日志 '{self.path}' 第 {lineno} 行格式错误: {e}") from e
+            self._entries.append(entry)
+            self._state[entry['id']] = entry['fp']
+            self.head_seq = entry['seq']
+
+    def _prepare_tail(self):
+        """追加前整理文件末尾：截掉写入中断留下的半行，给缺少换行的最后一行补上换行。"""
+        if self._torn_at is not None:
+            os.truncate(self.path, self._torn_at)
+            self._torn_at = None
+        if not os.path.exists(self.path) or not os.path.getsize(self.path):
+            return
+        with open(self.path, 'rb+') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                f.write(b'\n')
+
+    def record(self, questions, signatures=None):
+        """
+        把与日志中状态不同的题目记为新增或修改，返回新记录的条数。
+        """
+        self.load()
+        if signatures is None:
+            signatures = question_signatures(questions)
+        now = int(time.time())
+        new_entries = []
+        seen = set()
+        for qid, fingerprint in signatures:
+            # 旧题库中可能有归一化题干相同的题目，与题库的题干索引一致，只记第一道
+            if qid in seen:
+                continue
+            seen.add(qid)
+            old = self._state.get(qid)
+            if old == fingerprint:
+                continue
+            self.head_seq += 1
+            new_entries.append({"seq": self.head_seq, "time": now, "id": qid,
+                                "op": "add" if old is None else "modify", "fp": fingerprint})
+            self._state[qid] = fingerprint
+        if new_entries:
+            self._prepare_tail()
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.writelines(json.dumps(entry) + '\n' for entry in new_entries)
+                f.flush()
+                os.fsync(f.fileno())
+            self._entries.extend(new_entries)
+        return len(new_entries)
+
+    def changed_since(self, since):
+        """返回 parse_since 结果之后新增或修改过的编号集合。"""
+        self.load()
+        kind, value = since
+        if kind == "seq":
+            return {entry['id'] for entry in self._entries if entry['seq'] > value}
+        return {entry['id'] for entry in self._entries if entry['time'] >= value}
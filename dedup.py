@@ -0,0 +1,209 @@
+"""
+题干归一化与近似重复检测模块。
+
+- normalize_stem（定义于 normalize 模块）抹平空白、全角/半角标点、填空括号等差异，用作精确去重的键；
+- NearDuplicateIndex 基于字符 n-gram 的 MinHash 签名与 LSH 分桶查找近似重复，
+  签名计算全部用 numpy 向量化完成，整体复杂度与题目数量近似线性，无需两两比较。
+"""
+import numpy as np
+
+from normalize import normalize_stems
+
+SHINGLE_SIZE = 3
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+DEFAULT_THRESHOLD = 0.8
+# 分批计算签名，中间数组保持在 CPU 缓存附近
+BATCH_SIZE = 2000
+# candidate_pairs 每批比较的题目对数，限制取出的签名矩阵的内存占用
+PAIR_BATCH_SIZE = 100000
+
+_rng = np.random.default_rng(20240601)
+_HASH_A = _rng.integers(1, 2**63, size=NUM_PERM, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+_HASH_B = _rng.integers(0, 2**63, size=NUM_PERM, dtype=np.uint64)
+_BAND_MULT = _rng.integers(1, 2**63, size=ROWS, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+
+
+def _shingle_ids(texts):
+    """
+    把一批已归一化的文本切分为字符 n-gram，每个 n-gram 用码点拼成一个 uint64。
+
+    返回 (所有 n-gram 的数组, 每段在数组中的起始位置)。
+    """
+    padded = [t if len(t) >= SHINGLE_SIZE else t.ljust(SHINGLE_SIZE, '\0') for t in texts]
+    codepoints = np.frombuffer(''.join(padded).encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+    lengths = np.fromiter(map(len, padded), dtype=np.int64, count=len(padded))
+    text_starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    counts = lengths - SHINGLE_SIZE + 1
+    seg_starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    positions = np.repeat(text_starts - seg_starts, counts) + np.arange(counts.sum())
+
+    ids = codepoints[:-2] << np.uint64(42)
+    ids |= codepoints[1:-1] << np.uint64(21)
+    ids |= codepoints[2:]
+    return ids[positions], seg_starts
+
+
+def minhash_signatures(stems, normalized=False):
+    """计算一批题干的 MinHash 签名，返回形状为 (题目数, NUM_PERM) 的 uint32 矩阵。"""
+    signatures = np.empty((len(stems), NUM_PERM), dtype=np.uint32)
+    if not normalized:
+        stems = normalize_stems(list(stems))
+    for start in range(0, len(stems), BATCH_SIZE):
+        batch = stems[start:start + BATCH_SIZE]
+        ids, seg_starts = _shingle_ids(batch)
+        hashed = np.empty(len(ids), dtype=np.uint64)
+        minimums = np.empty((NUM_PERM, len(batch)), dtype=np.uint64)
+        for p in range(NUM_PERM):
+            # multiply-shift 哈希，uint64 乘法溢出即取模 2^64；右移是单调的，
+            # 因此先取各段最小值再右移，结果相同且少遍历一次
+            np.multiply(ids, _HASH_A[p], out=hashed)
+            hashed += _HASH_B[p]
+            np.minimum.reduceat(hashed, seg_starts, out=minimums[p])
+        minimums >>= np.uint64(32)
+        signatures[start:start + len(batch)] = minimums.T
+    return signatures
+
+
+def _band_keys(signatures):
+    """把签名的每个 band 压缩为一个 uint64 桶键，返回形状为 (BANDS, 题目数) 的矩阵。"""
+    bands = signatures.reshape(len(signatures), BANDS, ROWS).astype(np.uint64)
+    return (bands * _BAND_MULT).sum(axis=2, dtype=np.uint64).T.copy()
+
+
+def signature_similarity(sig_a, sig_b):
+    """用签名中相同位置的比例估计两个题干的 Jaccard 相似度。"""
+    return float(np.count_nonzero(sig_a == sig_b)) / NUM_PERM
+
+
+class NearDuplicateIndex:
+    """题干的近似重复索引，支持批量添加与批量查询。"""
+
+    def __init__(self, stems=(), threshold=DEFAULT_THRESHOLD, normalized=False):
+        self.threshold = threshold
+        self._signatures = np.empty((0, NUM_PERM), dtype=np.uint32)
+        self._order = np.empty((BANDS, 0), dtype=np.int64)
+        self._sorted_keys = np.empty((BANDS, 0), dtype=np.uint64)
+        self.add(list(stems), normalized)
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def add(self, stems, normalized=False):
+        """
+        添加题干，编号按添加顺序从 len(self) 开始递增。
+
+        新题的桶键排序后按位置插入已排序的各 band，不重新排序整个索引，
+        因此向大索引中少量添加的开销只与复制数组相当。
+        """
+        if not stems:
+            return
+        signatures = minhash_signatures(stems, normalized)
+        keys = _band_keys(signatures)
+        order = np.argsort(keys, axis=1, kind='stable')
+        sorted_keys = np.take_along_axis(keys, order, axis=1)
+        order += len(self)
+        if len(self):
+            # side='right' 让新题排在同键的已有题目之后，与整体稳定排序的结果一致
+            positions = [np.searchsorted(self._sorted_keys[band], sorted_keys[band], side='right')
+                         for band in range(BANDS)]
+            sorted_keys = np.stack([np.insert(self._sorted_keys[band], positions[band], sorted_keys[band])
+                                    for band in range(BANDS)])
+            order = np.stack([np.insert(self._order[band], positions[band], order[band])
+                              for band in range(BANDS)])
+        self._signatures = np.concatenate((self._signatures, signatures))
+        self._sorted_keys, self._order = sorted_keys, order
+
+    def query(self, stems, normalized=False):
+        """
+        为每个题干查找索引中的近似重复项。
+
+        返回与 stems 等长的列表，每项为按相似度降序排列的 [(编号, 相似度), ...]。
+        """
+        if not stems or not len(self):
+            return [[] for _ in stems]
+        signatures = minhash_signatures(stems, normalized)
+        keys = _band_keys(signatures)
+        bounds = [(np.searchsorted(self._sorted_keys[band], keys[band], side='left'),
+                   np.searchsorted(self._sorted_keys[band], keys[band], side='right'))
+                  for band in range(BANDS)]
+        results = []
+        for i in range(len(stems)):
+            candidates = set()
+            for band, (lo, hi) in enumerate(bounds):
+                if hi[i] > lo[i]:
+                    candidates.update(self._order[band, lo[i]:hi[i]].tolist())
+            matches = []
+            for idx in candidates:
+                similarity = signature_similarity(signatures[i], self._signatures[idx])
+                if similarity >= self.threshold:
+                    matches.append((idx, similarity))
+            matches.sort(key=lambda m: -m[1])
+            results.append(matches)
+        return results
+
+    def candidate_pairs(self):
+        """
+        枚举同一 LSH 桶内、相似度达到阈值的题目对，返回 {(较小编号, 较大编号), ...}。
+
+        每个桶只和桶内第一道题比较，桶的数量与题目数量成正比，因此不会退化为两两比较；
+        桶的划分与相似度计算都按 band 整体向量化完成。
+        """
+        count = len(self)
+        found = []
+        for band in range(BANDS):
+            row, order = self._sorted_keys[band], self._order[band]
+            if len(row) < 2:
+                continue
+            # 与前一项同键的位置都属于某个桶的非首项；各位置所在桶的起点为此前最后一个非同键位置
+            same = row[1:] == row[:-1]
+            members = np.flatnonzero(same) + 1
+            if not len(members):
+                continue
+            starts = np.arange(len(row))
+            starts[1:][same] = 0
+            np.maximum.accumulate(starts, out=starts)
+            heads, members = order[starts[members]], order[members]
+            for start in range(0, len(members), PAIR_BATCH_SIZE):
+                a, b = heads[start:start + PAIR_BATCH_SIZE], members[start:start + PAIR_BATCH_SIZE]
+                equal = np.count_nonzero(self._signatures[a] == self._signatures[b], axis=1)
+                keep = equal / NUM_PERM >= self.threshold
+                a, b = a[keep], b[keep]
+                found.append(np.minimum(a, b) * count + np.maximum(a, b))
+        if not found:
+            return set()
+        codes = np.unique(np.concatenate(found))
+        return set(zip((codes // count).tolist(), (codes % count).tolist()))
+
+
+def find_duplicate_clusters(stems, threshold=DEFAULT_THRESHOLD):
+    """
+    在整个题库中查找重复题目簇：归一化后完全相同的题干，以及 MinHash 判定的近似重复。
+
+    返回编号列表的列表，每个簇至少包含两道题，簇内编号升序。
+    """
+    parent = list(range(len(stems)))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(a, b):
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            parent[max(ra, rb)] = min(ra, rb)
+
+    normalized_stems = normalize_stems(list(stems))
+    first_by_key = {}
+    for i, key in enumerate(normalized_stems):
+        union(first_by_key.setdefault(key, i), i)
+    for a, b in NearDuplicateIndex(normalized_stems, threshold, normalized=True).candidate_pairs():
+        union(a, b)
+
+    clusters = {}
+    for i in range(len(stems)):
+        clusters.setdefault(find(i), []).append(i)
+    return [members for members in clusters.values() if len(members) > 1]
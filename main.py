@@ -1,16 +1,21 @@
 import json
 import argparse
+import csv
+import glob
+import itertools
+import os
 import time
-import pandas as pd
-from tqdm import tqdm
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.common.exceptions import NoSuchElementException, WebDriverException
-
-# 定义一个全局的字母表，用于根据顺序确定选项
-LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+# 注意：selenium、webdriver_manager、pandas、numpy、openpyxl、tqdm 等较重的依赖
+# 只在用到它们的函数内部导入，导出、检索等离线模式启动时不必加载浏览器相关的库。
+from attempt_log import attempts_path
+from bank_store import BankFormatError, convert_bank, open_bank
+from changelog import ChangeLog, changes_path
+from question_model import Question, QuestionBank
+from page_parser import LETTERS, extract_questions, parse_html_file
+from profiling import NULL_PROFILER, Profiler
+
+# 近似重复的默认相似度阈值，与 dedup.DEFAULT_THRESHOLD 保持一致
+DEFAULT_DUP_THRESHOLD = 0.8
 
 def js_click(driver, element):
     """
@@ -19,10 +24,34 @@ def js_click(driver, element):
     driver.execute_script("arguments[0].click();", element)
 
 # --- 题目解析与提取模块 ---
-def parse_questions(driver):
+def parse_questions(driver, mode="snapshot"):
+    """
+    解析当前页面上的所有题目。
+
+    mode 为 "snapshot" 时只读取一次 driver.page_source 并在本地解析；
+    为 "webdriver" 时逐个元素通过 WebDriver 读取（较慢，供页面结构异常时对照使用）。
+    """
+    if mode == "webdriver":
+        return parse_questions_webdriver(driver)
+
+    all_questions_data, errors, found_count = extract_questions(driver.page_source)
+    if not found_count:
+        print("未能找到类名为 'questionLi' 的题目。请检查页面内容或类名是否正确。")
+        return all_questions_data
+
+    print(f"找到了 {found_count} 道题目，已从页面快照中解析。")
+    for error in errors:
+        print(error)
+    return all_questions_data
+
+def parse_questions_webdriver(driver):
     """
-    解析当前页面上的所有题目元素，并带有进度条。
+    逐个元素解析当前页面上的所有题目，并带有进度条。
     """
+    from selenium.common.exceptions import NoSuchElementException
+    from selenium.webdriver.common.by import By
+    from tqdm import tqdm
+
     all_questions_data = []
     question_elements = driver.find_elements(By.CLASS_NAME, 'questionLi')
     
@@ -76,13 +105,17 @@ def parse_questions(driver):
 # --- 自动选择答案模块 ---
 def auto_select_answers(driver, question_bank, delay):
     """
-    自动在页面上选择题目的正确答案。
+    自动在页面上选择题目的正确答案，返回页面上的题目数。
     """
+    from selenium.common.exceptions import NoSuchElementException
+    from selenium.webdriver.common.by import By
+    from tqdm import tqdm
+
     print(f"开始自动选择答案 (操作延迟: {delay}秒)...")
     question_elements = driver.find_elements(By.CLASS_NAME, 'questionLi')
     if not question_elements:
         print("未找到题目，无法执行自动选择。")
-        return
+        return 0
 
     unmatched_count = 0
     for q_element in tqdm(question_elements, desc="正在自动答题"):
@@ -94,15 +127,10 @@ def auto_select_answers(driver, question_bank, delay):
             try:
                 full_stem_text = q_element.find_element(By.CSS_SELECTOR, 'h3.mark_name').get_attribute('textContent').strip()
                 q_stem = ')'.join(full_stem_text.split(')')[1:]).strip()
-                found_in_bank = False
-                for item in question_bank:
-                    if item['stem'] == q_stem:
-                        for i, (opt_text, is_correct) in enumerate(item['options']):
-                            if is_correct:
-                                correct_answer_letters.append(LETTERS[i])
-                        found_in_bank = True
-                        break
-                if not found_in_bank:
+                item = question_bank.get(q_stem)
+                if item is not None:
+                    correct_answer_letters = list(item.answer_letters)
+                else:
                     unmatched_count += 1
                     tqdm.write(f"警告: 题库中未找到题目 '{q_stem[:30]}...' 的答案。")
                     continue
@@ -135,49 +163,502 @@ def auto_select_answers(driver, question_bank, delay):
     print(f"\n自动选择完成！")
     if unmatched_count > 0:
         print(f"提示: 有 {unmatched_count} 道题目因无法在页面或题库中找到答案而未作答。")
+    return len(question_elements)
+
 
+# --- 修改：将题库流式导出为Excel (xlsx) / CSV / Parquet ---
+EXPORT_FORMATS = ('xlsx', 'csv', 'parquet')
+# Parquet 每批写入的行数
+PARQUET_BATCH_SIZE = 10000
 
-# --- 修改：将题库JSON转换为Excel (xlsx) ---
-def export_to_excel(question_bank, output_filename):
+def iter_export_rows(question_bank, max_options, ids=None):
     """
-    将题库数据（字典列表）转换为Excel文件。
+    逐行生成导出数据：题型、题干、选项A…、答案，缺少的选项列填 None。
+    给出 ids 时在最前面加一列题目编号。
+    """
+    for i, q in enumerate(question_bank):
+        row = [q.type, q.stem, *q.options, *[None] * (max_options - len(q.options)), q.answer_letters]
+        yield [ids[i], *row] if ids is not None else row
+
+def _write_xlsx(output_filename, header, rows):
+    from openpyxl import Workbook
+    # write_only 模式逐行写入磁盘，不在内存中保留整张表
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Sheet1")
+    sheet.append(header)
+    for row in rows:
+        sheet.append(row)
+    workbook.save(output_filename)
+
+def _write_csv(output_filename, header, rows):
+    # utf-8-sig 让 Excel 能正确识别中文
+    with open(output_filename, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+def _write_parquet(output_filename, header, rows):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("导出 Parquet 需要安装 pyarrow: pip install pyarrow")
+    schema = pa.schema([(name, pa.string()) for name in header])
+    with pq.ParquetWriter(output_filename, schema) as writer:
+        while True:
+            batch = list(itertools.islice(rows, PARQUET_BATCH_SIZE))
+            if not batch:
+                break
+            writer.write_table(pa.Table.from_pylist([dict(zip(header, row)) for row in batch], schema=schema))
+
+_EXPORT_WRITERS = {'xlsx': _write_xlsx, 'csv': _write_csv, 'parquet': _write_parquet}
+
+def export_to_excel(question_bank, output_filename, fmt=None, ids=None):
+    """
+    将题库数据（QuestionBank 或 Question 列表）流式导出为Excel、CSV或Parquet文件。
+
+    先遍历一次得到最大选项数以确定列，再逐行写出，内存占用与题库大小无关。
+    未指定 fmt 时根据文件扩展名判断，默认为 xlsx。给出 ids 时增加“编号”列，导入时会被忽略。
     """
     if not question_bank:
         print("错误: 题库为空，无法导出。")
         return
+    from tqdm import tqdm
 
-    print(f"正在将 {len(question_bank)} 道题目转换为Excel格式...")
-    processed_questions = []
-    for q in tqdm(question_bank, desc="转换进度"):
-        question_data = {
-            '题型': q['type'],
-            '题干': q['stem']
-        }
-        correct_answers = []
-        for i, (option_text, is_correct) in enumerate(q['options']):
-            option_letter = LETTERS[i]
-            question_data[f'选项{option_letter}'] = option_text
-            if is_correct:
-                correct_answers.append(option_letter)
-        
-        question_data['答案'] = ''.join(correct_answers)
-        processed_questions.append(question_data)
-
-    df = pd.DataFrame(processed_questions)
-    
-    max_options = 0
-    if question_bank:
-      max_options = max(len(q['options']) for q in question_bank) if any(q['options'] for q in question_bank) else 0
+    if fmt is None:
+        ext = os.path.splitext(output_filename)[1].lower().lstrip('.')
+        fmt = ext if ext in EXPORT_FORMATS else 'xlsx'
 
-    column_order = ['题型', '题干'] + [f'选项{LETTERS[i]}' for i in range(max_options)] + ['答案']
-    df = df.reindex(columns=column_order)
+    print(f"正在将 {len(question_bank)} 道题目导出为 {fmt} 格式...")
+    max_options = max((len(q.options) for q in question_bank), default=0)
+    header = ['题型', '题干'] + [f'选项{LETTERS[i]}' for i in range(max_options)] + ['答案']
+    if ids is not None:
+        header.insert(0, '编号')
+    rows = iter(tqdm(iter_export_rows(question_bank, max_options, ids), total=len(question_bank), desc="转换进度"))
 
     try:
-        # 使用 to_excel 保存，需要 openpyxl 引擎
-        df.to_excel(output_filename, index=False, engine='openpyxl')
+        _EXPORT_WRITERS[fmt](output_filename, header, rows)
         print(f"\n成功！题库已导出到 '{output_filename}'。")
     except Exception as e:
-        print(f"\n导出Excel时发生错误: {e}")
+        print(f"\n导出{fmt}时发生错误: {e}")
+
+
+# --- 从Excel/CSV导入题库 ---
+def read_question_table(input_filename):
+    """
+    读取 export_to_excel 格式的表格（题型、题干、选项A…、答案），转换为题目字典列表。
+
+    答案字母到 [选项文本, 是否正确] 的转换按列向量化完成，不逐行循环处理。
+    """
+    import numpy as np
+    import pandas as pd
+
+    if input_filename.lower().endswith('.csv'):
+        df = pd.read_csv(input_filename, dtype=str, encoding='utf-8-sig')
+    else:
+        df = pd.read_excel(input_filename, dtype=str, engine='openpyxl')
+    df.columns = [str(col).strip() for col in df.columns]
+    if '题干' not in df.columns or '答案' not in df.columns:
+        raise ValueError("表格缺少 '题干' 或 '答案' 列。")
+
+    option_cols = sorted((col for col in df.columns if len(col) == 3 and col.startswith('选项') and col[2] in LETTERS),
+                         key=lambda col: LETTERS.index(col[2]))
+    stems = df['题干'].fillna('').str.strip()
+    df = df[stems != ''].reset_index(drop=True)
+    stems = stems[stems != ''].reset_index(drop=True)
+
+    answers = df['答案'].fillna('').str.upper().str.replace(r'[^A-Z]', '', regex=True)
+    if '题型' in df.columns:
+        types = df['题型'].fillna('').str.strip()
+    else:
+        types = pd.Series('', index=df.index)
+    # 缺少题型时按答案个数推断
+    inferred = np.where(answers.str.len() > 1, '多选题', '单选题')
+    types = types.where(types != '', pd.Series(inferred, index=df.index))
+
+    option_texts = df[option_cols].apply(lambda col: col.str.strip())
+    present = (option_texts.notna() & (option_texts != '')).to_numpy()
+    correct = np.column_stack([answers.str.contains(col[2], regex=False).to_numpy() for col in option_cols]) \
+        if option_cols else np.zeros((len(df), 0), dtype=bool)
+    texts = option_texts.to_numpy(dtype=object)
+
+    missing_answers = int((answers == '').sum())
+    if missing_answers:
+        print(f"警告: 有 {missing_answers} 道题目没有填写答案。")
+
+    return [
+        {"type": q_type, "stem": stem,
+         "options": [(text, bool(is_correct)) for text, is_correct, keep in zip(text_row, correct_row, present_row) if keep]}
+        for q_type, stem, text_row, correct_row, present_row
+        in zip(types.tolist(), stems.tolist(), texts, correct, present)
+    ]
+
+def import_question_table(input_filename, question_bank, store, threshold=DEFAULT_DUP_THRESHOLD):
+    """
+    从Excel/CSV表格导入题目，按与选项2相同的去重规则合并到题库。
+    """
+    start_time = time.perf_counter()
+    try:
+        imported = read_question_table(input_filename)
+    except FileNotFoundError:
+        print(f"错误: 文件 '{input_filename}' 不存在。")
+        return
+    except Exception as e:
+        print(f"错误: 读取 '{input_filename}' 失败: {e}")
+        return
+    read_seconds = time.perf_counter() - start_time
+
+    added_items = merge_into_bank(question_bank, imported, threshold)
+    if not save_question_bank(store, added_items):
+        return
+    print(f"\n从 '{input_filename}' 读取 {len(imported)} 道题目（耗时 {read_seconds:.2f} 秒）。")
+    print(f"其中 {len(added_items)} 道新题已添加至 '{store.path}'，题库现在总共有 {len(question_bank)} 道题目。")
+
+
+# --- 题库合并与保存 ---
+def merge_into_bank(question_bank, new_items, threshold=DEFAULT_DUP_THRESHOLD):
+    """
+    将新题目（字典）按归一化后的题干去重后追加到题库中，返回新增的 Question 列表。
+
+    归一化会忽略空白、全角/半角标点和填空括号写法的差异；
+    与已有题目高度相似但不完全相同的新题仍会添加，同时给出疑似重复的提示。
+    近似重复索引保存在题库中，多次合并时只为新增的题目计算签名。
+    """
+    existing_count = len(question_bank)
+    added_items = question_bank.add_new([Question.from_dict(item) for item in new_items])
+
+    if added_items and existing_count:
+        near_dup_index = question_bank.near_duplicate_index(threshold, existing_count)
+        for item, matches in zip(added_items, near_dup_index.query([q.stem for q in added_items])):
+            if matches:
+                idx, similarity = matches[0]
+                print(f"提示: 新题 '{item.stem[:30]}...' 与已有题目 '{question_bank[idx].stem[:30]}...' "
+                      f"疑似重复 (相似度 {similarity:.2f})。")
+    return added_items
+
+def save_question_bank(store, added_items):
+    """
+    只把新增的题目写入题库存储（JSON后端会原子地整体重写）。
+
+    已启用变更日志（做过增量导出）的题库同时记录这些新题。
+    题库或变更日志文件无法解析时打印错误并返回 False，不会覆盖原文件。
+    """
+    if added_items:
+        try:
+            store.upsert([q.to_dict() for q in added_items])
+            change_log = ChangeLog(changes_path(store.path))
+            if change_log.exists():
+                change_log.record(added_items)
+        except BankFormatError as e:
+            print(f"错误: 保存失败，{e}")
+            return False
+        remind_rebuild_shards(store.path)
+    return True
+
+def remind_rebuild_shards(db_filename):
+    """题库旁已有 --build-shards 生成的 shards/ 时，提醒重新生成，否则 test.html 仍使用旧题目。"""
+    from static_export import MANIFEST_NAME
+
+    shards_dir = os.path.join(os.path.dirname(os.path.abspath(db_filename)), "shards")
+    if os.path.exists(os.path.join(shards_dir, MANIFEST_NAME)):
+        print(f"提示: 题库已更新，请运行 'python main.py --db {db_filename} --build-shards {shards_dir}' "
+              f"重新生成 test.html 使用的分片。")
+
+
+def report_duplicates(question_bank, threshold=DEFAULT_DUP_THRESHOLD):
+    """
+    查找并打印整个题库中的重复题目簇。
+    """
+    from dedup import find_duplicate_clusters
+
+    print(f"正在检查 {len(question_bank)} 道题目中的重复项 (相似度阈值: {threshold})...")
+    start_time = time.perf_counter()
+    clusters = find_duplicate_clusters(question_bank.stems(), threshold)
+    elapsed = time.perf_counter() - start_time
+
+    for n, members in enumerate(clusters, 1):
+        print(f"\n重复簇 {n} ({len(members)} 道题):")
+        for idx in members:
+            print(f"  [{idx}] ({question_bank[idx].type}) {question_bank[idx].stem}")
+    duplicate_count = sum(len(members) - 1 for members in clusters)
+    print(f"\n共发现 {len(clusters)} 个重复簇，涉及 {duplicate_count} 道可能多余的题目，耗时 {elapsed:.2f} 秒。")
+
+
+# --- 题库检索 ---
+def search_question_bank(question_bank, db_filename, query, limit=10):
+    """
+    在题库中检索题干或选项包含查询内容的题目，并打印正确答案。
+    """
+    from search import open_search_index
+
+    start_time = time.perf_counter()
+    index = open_search_index(db_filename, question_bank)
+    load_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    results = index.search(query, limit)
+    query_ms = (time.perf_counter() - start_time) * 1000
+
+    if not results:
+        print(f"未找到与 '{query}' 相关的题目。")
+    for rank, (score, stem) in enumerate(results, 1):
+        q = question_bank.get(stem)
+        print(f"\n{rank}. ({q.type}) {q.stem}  [匹配度 {score:.2f}]")
+        for i, (option_text, is_correct) in enumerate(q.iter_options()):
+            mark = "✔" if is_correct else " "
+            print(f"   {mark} {LETTERS[i]}. {option_text}")
+        print(f"   正确答案: {q.answer_letters or '无'}")
+    print(f"\n索引加载/同步耗时 {load_seconds:.2f} 秒，检索耗时 {query_ms:.1f} 毫秒。")
+
+
+# --- 合并多个题库文件 ---
+def merge_bank_files(paths, output_filename, workers=None):
+    """
+    并行加载多个题库文件并按归一化题干合并，写出合并后的题库与冲突报告。
+    """
+    from bank_merge import merge_banks, write_conflict_report
+
+    start_time = time.perf_counter()
+    merged, conflicts, contributed = merge_banks(paths, workers)
+    if not contributed:
+        print("错误: 没有成功加载任何题库，合并取消。")
+        return
+    store = open_bank(output_filename)
+    try:
+        store.replace_all(merged)
+    finally:
+        store.close()
+    elapsed = time.perf_counter() - start_time
+
+    for path, count in contributed.items():
+        print(f"  '{path}': 贡献 {count} 道新题")
+    print(f"\n合并完成！共 {len(merged)} 道题目已写入 '{output_filename}'，耗时 {elapsed:.2f} 秒。")
+    if conflicts:
+        report_filename = os.path.splitext(output_filename)[0] + ".conflicts.json"
+        write_conflict_report(conflicts, report_filename)
+        answer_conflicts = sum(1 for c in conflicts if c['kind'] == 'answer')
+        print(f"发现 {len(conflicts)} 道冲突题目（答案不一致 {answer_conflicts} 道，"
+              f"选项不一致 {len(conflicts) - answer_conflicts} 道），详情见 '{report_filename}'。")
+        print("冲突题目均保留了最先出现的版本。")
+    else:
+        print("未发现答案或选项冲突。")
+
+
+# --- 为 test.html 生成分片的静态题库 ---
+def build_static_shards(question_bank, output_dir, shard_size):
+    """
+    将题库写为带内容哈希的压缩分片和 manifest.json，供 test.html 按需加载。
+    """
+    from static_export import build_shards
+
+    manifest = build_shards(question_bank.to_dicts(), output_dir, shard_size)
+    type_summary = "，".join(f"{q_type} {count} 道" for q_type, count in manifest['types'].items())
+    print(f"成功！已将 {manifest['total']} 道题目（{type_summary}）写为 {len(manifest['shards'])} 个分片，"
+          f"输出目录 '{output_dir}'。")
+
+
+# --- 增量导出与应用补丁 ---
+def export_delta(question_bank, db_filename, since, output_filename, fmt=None):
+    """
+    只导出 since（变更序号或日期）之后新增或修改过的题目。
+
+    .json 输出为可用 --apply-delta 应用的补丁，其他扩展名按 export_to_excel 的表格格式导出。
+    导出前先把题库中尚未记入变更日志的变化补记下来（首次使用时全部记为新增）。
+    """
+    from changelog import DELTA_FORMAT, DELTA_VERSION, parse_since, question_signatures
+
+    try:
+        since = parse_since(since)
+    except ValueError as e:
+        print(f"错误: {e}")
+        return
+    change_log = ChangeLog(changes_path(db_filename))
+    signatures = question_signatures(list(question_bank))
+    try:
+        recorded = change_log.record(None, signatures)
+    except BankFormatError as e:
+        print(f"错误: {e}")
+        return
+    if recorded:
+        print(f"变更日志新记录了 {recorded} 道新增或修改的题目。")
+
+    changed = change_log.changed_since(since)
+    selected = [(q, qid) for q, (qid, _) in zip(question_bank, signatures) if qid in changed]
+    if not selected:
+        print(f"自 {since[1]} 以来没有新增或修改的题目，当前变更序号为 {change_log.head_seq}。")
+        return
+
+    if output_filename.lower().endswith('.json'):
+        delta = {
+            "format": DELTA_FORMAT,
+            "version": DELTA_VERSION,
+            "since": since[1],
+            "head_seq": change_log.head_seq,
+            "questions": [{"id": qid, **q.to_dict()} for q, qid in selected],
+        }
+        with open(output_filename, 'w', encoding='utf-8') as f:
+            json.dump(delta, f, ensure_ascii=False, indent=2)
+        print(f"成功！{len(selected)} 道变更题目已导出到 '{output_filename}'。")
+    else:
+        export_to_excel([q for q, _ in selected], output_filename, fmt, ids=[qid for _, qid in selected])
+    print(f"当前变更序号为 {change_log.head_seq}，下次可使用 --since {change_log.head_seq} 只导出之后的变更。")
+
+def read_delta(delta_filename):
+    """读取 --export-delta 生成的 JSON 补丁或表格，返回题目字典列表。"""
+    if not delta_filename.lower().endswith('.json'):
+        return read_question_table(delta_filename)
+    from changelog import DELTA_FORMAT
+
+    with open(delta_filename, 'r', encoding='utf-8') as f:
+        delta = json.load(f)
+    if not isinstance(delta, dict) or delta.get("format") != DELTA_FORMAT:
+        raise ValueError("不是有效的增量补丁文件。")
+    return delta["questions"]
+
+def apply_delta(question_bank, store, delta_filename):
+    """
+    把增量补丁应用到题库：编号已存在且内容不同的题目被更新，新编号的题目被追加。
+
+    编号只由归一化题干决定，因此选项或答案被修改过的题目会更新本地的同一道题。
+    """
+    from changelog import question_signatures
+
+    try:
+        items = read_delta(delta_filename)
+    except FileNotFoundError:
+        print(f"错误: 文件 '{delta_filename}' 不存在。")
+        return
+    except Exception as e:
+        print(f"错误: 读取补丁 '{delta_filename}' 失败: {e}")
+        return
+
+    incoming = [Question.from_dict(item) for item in items]
+    local_signatures = question_signatures(list(question_bank))
+    change_log = ChangeLog(changes_path(store.path))
+    try:
+        if change_log.exists():
+            change_log.load()
+        else:
+            # 先为本地题库建立基线，之后从本机导出的增量只包含真正的变更
+            change_log.record(None, local_signatures)
+    except BankFormatError as e:
+        print(f"错误: {e}")
+        return
+    by_id = {}
+    for i, (qid, fingerprint) in enumerate(local_signatures):
+        by_id.setdefault(qid, (i, fingerprint))
+    new_questions, modified = [], []
+    for question, (qid, fingerprint) in zip(incoming, question_signatures(incoming)):
+        local = by_id.get(qid)
+        if local is None:
+            new_questions.append(question)
+        elif local[1] != fingerprint:
+            index = local[0]
+            # 保留本地的题干写法，题库存储按题干更新
+            updated = Question(question.type, question_bank[index].stem, question.options, question.answer_mask)
+            question_bank.replace(index, updated)
+            modified.append(updated)
+    added = question_bank.add_new(new_questions)
+
+    if added or modified:
+        store.upsert([q.to_dict() for q in added + modified])
+        change_log.record(added + modified)
+        remind_rebuild_shards(store.path)
+    skipped = len(new_questions) - len(added)
+    print(f"补丁 '{delta_filename}' 共 {len(incoming)} 道题目：新增 {len(added)} 道，更新 {len(modified)} 道，"
+          f"{len(incoming) - len(new_questions) - len(modified)} 道已是最新。")
+    if skipped:
+        print(f"提示: 补丁中有 {skipped} 道题目与其他题目的题干重复，已跳过。")
+    print(f"题库现在总共有 {len(question_bank)} 道题目。")
+
+
+# --- 练习数据分析 ---
+def analyze_attempts(log_dir, report_filename):
+    """
+    统计 test.py 记录的作答日志，打印概览并写出分析报告。
+    """
+    if not os.path.isdir(log_dir):
+        print(f"错误: 作答日志 '{log_dir}' 不存在，请先使用 test.py 完成至少一次测验。")
+        return
+    from analytics import compute_analytics, load_attempts, write_report
+
+    start_time = time.perf_counter()
+    attempts, question_table = load_attempts(log_dir)
+    if attempts.empty:
+        print(f"错误: 作答日志 '{log_dir}' 中没有记录。")
+        return
+    results = compute_analytics(attempts, question_table)
+    write_report(results, report_filename)
+    elapsed = time.perf_counter() - start_time
+
+    overview = results["概览"]["value"]
+    print(f"共 {overview['作答次数']} 次作答，涉及 {overview['涉及题目']} 道题目，"
+          f"总体错误率 {overview['总体错误率']:.1%}。")
+    for row in results["题型统计"].itertuples():
+        print(f"  {row.Index}: 作答 {row.attempts} 次，错误率 {row.error_rate:.1%}")
+    print(f"\n分析报告已写入 '{report_filename}'，耗时 {elapsed:.2f} 秒。")
+
+
+# --- 离线批量导入已保存的HTML页面 ---
+def collect_html_files(patterns):
+    """
+    将目录或通配符展开为待解析的HTML文件列表（去重并保持顺序）。
+    """
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matched = [os.path.join(dirpath, name)
+                       for dirpath, _, names in os.walk(pattern)
+                       for name in names if name.lower().endswith(('.html', '.htm'))]
+        else:
+            matched = glob.glob(pattern, recursive=True)
+        if not matched:
+            print(f"警告: '{pattern}' 没有匹配到任何HTML文件。")
+        files.extend(sorted(matched))
+    return list(dict.fromkeys(files))
+
+def import_html_pages(patterns, question_bank, store, workers=None, threshold=DEFAULT_DUP_THRESHOLD):
+    """
+    使用进程池并行解析已保存的题目页面，合并到题库后一次性写回。
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from tqdm import tqdm
+
+    files = collect_html_files(patterns)
+    if not files:
+        print("错误: 没有找到可导入的HTML文件。")
+        return
+
+    workers = workers or os.cpu_count() or 1
+    print(f"正在使用 {workers} 个进程解析 {len(files)} 个HTML文件...")
+    start_time = time.perf_counter()
+    scraped_data = []
+    failed_files = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {path: executor.submit(parse_html_file, path) for path in files}
+        for path, future in tqdm(futures.items(), desc="解析页面"):
+            try:
+                _, questions, errors, found_count = future.result()
+            except Exception as e:
+                failed_files += 1
+                tqdm.write(f"文件 '{path}' 解析失败: {e}")
+                continue
+            if not found_count:
+                tqdm.write(f"警告: 文件 '{path}' 中未找到类名为 'questionLi' 的题目。")
+            for error in errors:
+                tqdm.write(f"文件 '{path}': {error}")
+            scraped_data.extend(questions)
+    parse_seconds = time.perf_counter() - start_time
+
+    added_items = merge_into_bank(question_bank, scraped_data, threshold)
+    if not save_question_bank(store, added_items):
+        return
+    total_seconds = time.perf_counter() - start_time
+
+    print(f"\n共解析 {len(files)} 个文件（失败 {failed_files} 个），提取 {len(scraped_data)} 道题目。")
+    print(f"其中 {len(added_items)} 道新题已添加至 '{store.path}'，题库现在总共有 {len(question_bank)} 道题目。")
+    print(f"解析耗时 {parse_seconds:.2f} 秒（{len(files) / max(parse_seconds, 1e-9):.1f} 文件/秒，"
+          f"{len(scraped_data) / max(parse_seconds, 1e-9):.1f} 题/秒），总耗时 {total_seconds:.2f} 秒。")
 
 
 # --- 主程序与菜单 ---
@@ -190,35 +671,179 @@ def main():
         formatter_class=argparse.RawTextHelpFormatter 
     )
     # 修改：参数名从 --output 改为 --db
-    parser.add_argument("--db", type=str, default="题库.json", help="指定题库JSON数据库的文件名。\n(默认: 题库.json)")
+    parser.add_argument("--db", type=str, default="题库.json",
+                        help="指定题库数据库的文件名，按扩展名选择存储方式：\n.json 整体写入，.jsonl 追加日志，.sqlite/.db SQLite，\n.xqb 编译后的二进制题库（mmap 按需解码）。\n(默认: 题库.json)")
     parser.add_argument("--url", type=str, help="预设要操作的URL。")
     parser.add_argument("--cookies", type=str, default="cookies.json", help="指定Cookies文件名。(默认: cookies.json)")
     parser.add_argument("--delay", type=float, default=0, help="每次点击操作之间的延迟(秒)。(默认: 0)")
+    parser.add_argument("--parse-mode", choices=["snapshot", "webdriver"], default="snapshot",
+                        help="提取题目的方式：snapshot 读取整页快照后本地解析，\nwebdriver 逐个元素读取。(默认: snapshot)")
     # 修改：参数从 --export-csv 改为 --export-excel
     parser.add_argument("--export-excel", type=str, metavar="FILENAME.xlsx", nargs='?', const="题库.xlsx",
                         help="将题库直接导出为Excel文件并退出。\n可以指定文件名，若不指定则默认为 '题库.xlsx'。")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default=None,
+                        help="导出格式，可选 xlsx / csv / parquet。\n(默认: 根据文件扩展名判断，否则为 xlsx)")
+    parser.add_argument("--import-excel", type=str, metavar="FILENAME.xlsx",
+                        help="从 export_to_excel 格式的Excel文件导入题目并退出。")
+    parser.add_argument("--import-csv", type=str, metavar="FILENAME.csv",
+                        help="从 export_to_excel 格式的CSV文件导入题目并退出。")
+    parser.add_argument("--import-html", type=str, nargs='+', metavar="PATH",
+                        help="离线导入已保存的题目页面(.html)并退出。\n可以指定目录或通配符，例如 'pages/*.html'。")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="离线导入或合并题库时使用的进程数。(默认: CPU核心数)")
+    parser.add_argument("--dedupe", action="store_true",
+                        help="检查整个题库中的重复与近似重复题目，打印重复簇后退出。")
+    parser.add_argument("--dup-threshold", type=float, default=DEFAULT_DUP_THRESHOLD,
+                        help=f"判定近似重复的相似度阈值(0~1)。(默认: {DEFAULT_DUP_THRESHOLD})")
+    parser.add_argument("--search", type=str, metavar="QUERY",
+                        help="在题库的题干和选项中检索，打印匹配的题目及正确答案后退出。")
+    parser.add_argument("--limit", type=int, default=10, help="检索时最多显示的结果数。(默认: 10)")
+    parser.add_argument("--merge", type=str, nargs='+', metavar="BANK",
+                        help="合并多个题库文件（按参数顺序，先出现的版本优先），\n写出合并结果与冲突报告后退出。")
+    parser.add_argument("--merge-output", type=str, default="题库_合并.json",
+                        help="合并结果的文件名。(默认: 题库_合并.json)")
+    parser.add_argument("--convert-to", type=str, metavar="FILENAME",
+                        help="将 --db 指定的题库转换为另一种存储格式并退出，\n例如 --db 题库.json --convert-to 题库.sqlite。")
+    parser.add_argument("--build-shards", type=str, metavar="DIR", nargs='?', const="shards",
+                        help="为 test.html 生成压缩分片与 manifest.json 并退出。\n可以指定输出目录，若不指定则默认为 'shards'。")
+    parser.add_argument("--shard-size", type=int, default=200, help="每个分片包含的题目数。(默认: 200)")
+    parser.add_argument("--export-delta", type=str, metavar="FILENAME",
+                        help="只导出 --since 之后新增或修改的题目并退出。\n.json 为可应用的补丁，.xlsx/.csv 为表格。")
+    parser.add_argument("--since", type=str, default=None,
+                        help="增量导出的起点：变更序号（如 120）或日期（如 2024-05-01）。\n与 --export-excel 同时使用时也只导出变更的题目。(默认: 0，即全部)")
+    parser.add_argument("--apply-delta", type=str, metavar="FILENAME",
+                        help="将 --export-delta 导出的补丁（.json/.xlsx/.csv）应用到题库并退出。")
+    parser.add_argument("--analytics", type=str, metavar="REPORT", nargs='?', const="练习报告.md",
+                        help="分析 test.py 记录的作答日志并写出报告后退出。\n.xlsx 输出为多个工作表，其他扩展名为Markdown。(默认: 练习报告.md)")
+    parser.add_argument("--attempt-log", type=str, metavar="DIR",
+                        help="作答日志目录。(默认: 题库文件名加上 .attempts)")
+    parser.add_argument("--profile", action="store_true",
+                        help="记录各阶段耗时、WebDriver命令次数及题库规模，退出时打印汇总表。")
+    parser.add_argument("--profile-trace", type=str, metavar="FILENAME.json",
+                        help="同时把性能剖析的详细记录写入JSON文件（隐含 --profile）。")
     
     args = parser.parse_args()
+    profiler = Profiler() if args.profile or args.profile_trace else NULL_PROFILER
+    try:
+        run(args, profiler)
+    finally:
+        profiler.report(args.profile_trace)
+
 
+def run(args, profiler):
+    """
+    按命令行参数执行离线操作，或进入交互菜单。
+    """
     driver = None
-    question_bank = []
+    question_bank = QuestionBank()
+    load_failed = False
     
     # 修改：使用 args.db 加载题库
+    store = open_bank(args.db)
     try:
-        with open(args.db, 'r', encoding='utf-8') as f:
-            question_bank = json.load(f)
+        with profiler.stage("加载题库") as record:
+            question_bank = QuestionBank.from_dicts(store.load())
+            record.items = len(question_bank)
         print(f"已成功加载本地题库 '{args.db}'，共 {len(question_bank)} 道题目。")
     except FileNotFoundError:
         print(f"本地题库 '{args.db}' 不存在，将在提取后创建。")
-    except json.JSONDecodeError:
-        print(f"警告: 题库文件 '{args.db}' 格式错误，无法解析。")
+    except BankFormatError:
+        load_failed = True
+        print(f"警告: 题库文件 '{args.db}' 格式错误，无法解析；为避免覆盖原文件，写入题库的操作将被拒绝。")
+    write_refused = f"错误: 题库 '{args.db}' 加载失败，无法写入。请先修复或更换 --db 指定的题库文件。"
+
+    if args.convert_to:
+        if not question_bank:
+            print(f"错误: 题库 '{args.db}' 为空或加载失败，无法执行转换。")
+            return
+        with profiler.stage("格式转换") as record:
+            count = record.items = convert_bank(args.db, args.convert_to)
+        print(f"成功！已将 {count} 道题目从 '{args.db}' 转换到 '{args.convert_to}'。")
+        return
+
+    if args.export_delta or (args.export_excel and args.since is not None):
+        if not question_bank:
+            print(f"错误: 题库 '{args.db}' 为空或加载失败，无法执行导出。")
+            return
+        with profiler.stage("增量导出", question_bank):
+            export_delta(question_bank, args.db, args.since or "0",
+                         args.export_delta or args.export_excel, args.format)
+        return
+
+    if args.apply_delta:
+        if load_failed:
+            print(write_refused)
+            return
+        with profiler.stage("应用补丁", question_bank):
+            apply_delta(question_bank, store, args.apply_delta)
+        return
 
     # 修改：处理 --export-excel 参数
     if args.export_excel:
         if not question_bank:
             print(f"错误: 题库 '{args.db}' 为空或加载失败，无法执行导出。")
             return
-        export_to_excel(question_bank, args.export_excel)
+        output_filename = args.export_excel
+        if args.format and output_filename == "题库.xlsx":
+            output_filename = f"题库.{args.format}"
+        with profiler.stage("导出", question_bank) as record:
+            record.items = len(question_bank)
+            export_to_excel(question_bank, output_filename, args.format)
+        return
+
+    if args.build_shards:
+        if not question_bank:
+            print(f"错误: 题库 '{args.db}' 为空或加载失败，无法生成分片。")
+            return
+        if args.shard_size <= 0:
+            print("错误: --shard-size 必须为正数。")
+            return
+        with profiler.stage("生成分片", question_bank) as record:
+            record.items = len(question_bank)
+            build_static_shards(question_bank, args.build_shards, args.shard_size)
+        return
+
+    if args.analytics:
+        with profiler.stage("练习分析"):
+            analyze_attempts(args.attempt_log or attempts_path(args.db), args.analytics)
+        return
+
+    if args.merge:
+        with profiler.stage("合并题库文件"):
+            merge_bank_files(args.merge, args.merge_output, args.workers)
+        return
+
+    if args.search:
+        if not question_bank:
+            print(f"错误: 题库 '{args.db}' 为空或加载失败，无法检索。")
+            return
+        with profiler.stage("检索", question_bank):
+            search_question_bank(question_bank, args.db, args.search, args.limit)
+        return
+
+    if args.dedupe:
+        if not question_bank:
+            print(f"错误: 题库 '{args.db}' 为空或加载失败，无法检查重复。")
+            return
+        with profiler.stage("重复检查", question_bank) as record:
+            record.items = len(question_bank)
+            report_duplicates(question_bank, args.dup_threshold)
+        return
+
+    if args.import_excel or args.import_csv:
+        if load_failed:
+            print(write_refused)
+            return
+        with profiler.stage("表格导入", question_bank):
+            import_question_table(args.import_excel or args.import_csv, question_bank, store, args.dup_threshold)
+        return
+
+    if args.import_html:
+        if load_failed:
+            print(write_refused)
+            return
+        with profiler.stage("HTML导入", question_bank):
+            import_html_pages(args.import_html, question_bank, store, args.workers, args.dup_threshold)
         return
 
     while True:
@@ -241,10 +866,16 @@ def main():
                 print("URL为空，操作取消。")
                 continue
             
+            from selenium import webdriver
+            from selenium.common.exceptions import WebDriverException
+            from selenium.webdriver.chrome.service import Service
+            from webdriver_manager.chrome import ChromeDriverManager
+
             try:
                 print("正在启动浏览器...")
-                service = Service(ChromeDriverManager().install())
-                driver = webdriver.Chrome(service=service)
+                with profiler.stage("启动浏览器"):
+                    service = Service(ChromeDriverManager().install())
+                    driver = profiler.instrument_driver(webdriver.Chrome(service=service))
                 
                 if args.cookies:
                     try:
@@ -258,7 +889,8 @@ def main():
                         print(f"加载Cookies时出错: {e}")
 
                 print(f"正在导航至目标URL: {url}")
-                driver.get(url)
+                with profiler.stage("页面加载"):
+                    driver.get(url)
                 args.url = url
                 
                 print("-" * 50)
@@ -277,19 +909,23 @@ def main():
             if not driver:
                 print("错误: 请先选择 '1' 打开浏览器。")
                 continue
-            scraped_data = parse_questions(driver)
+            if load_failed:
+                print(write_refused)
+                continue
+            with profiler.stage("解析题目") as record:
+                scraped_data = parse_questions(driver, args.parse_mode)
+                record.items = len(scraped_data)
             if scraped_data:
-                existing_stems = {item['stem'] for item in question_bank}
-                new_items_count = 0
-                for item in scraped_data:
-                    if item['stem'] not in existing_stems:
-                        question_bank.append(item)
-                        existing_stems.add(item['stem'])
-                        new_items_count += 1
+                with profiler.stage("合并去重", question_bank) as record:
+                    added_items = merge_into_bank(question_bank, scraped_data, args.dup_threshold)
+                    record.items = len(scraped_data)
                 # 修改：使用 args.db 保存题库
-                with open(args.db, 'w', encoding='utf-8') as f:
-                    json.dump(question_bank, f, ensure_ascii=False, indent=4)
-                print(f"\n成功提取 {len(scraped_data)} 道题目。其中 {new_items_count} 道新题已添加至 '{args.db}'。")
+                with profiler.stage("保存题库", question_bank) as record:
+                    saved = save_question_bank(store, added_items)
+                    record.items = len(added_items)
+                if not saved:
+                    continue
+                print(f"\n成功提取 {len(scraped_data)} 道题目。其中 {len(added_items)} 道新题已添加至 '{args.db}'。")
                 print(f"题库现在总共有 {len(question_bank)} 道题目。")
             else:
                 print("未能提取到任何题目。")
@@ -300,7 +936,8 @@ def main():
                 continue
             if not question_bank:
                  print("警告: 本地题库为空，将仅依赖页面上可能存在的'正确答案'进行选择。")
-            auto_select_answers(driver, question_bank, args.delay)
+            with profiler.stage("自动答题") as record:
+                record.items = auto_select_answers(driver, question_bank, args.delay)
         
         # 修改：处理菜单 '4'
         elif choice == '4':
@@ -313,11 +950,14 @@ def main():
             # 确保文件名以 .xlsx 结尾
             if not xlsx_filename.lower().endswith('.xlsx'):
                 xlsx_filename += '.xlsx'
-            export_to_excel(question_bank, xlsx_filename)
+            with profiler.stage("导出", question_bank) as record:
+                record.items = len(question_bank)
+                export_to_excel(question_bank, xlsx_filename)
 
         elif choice == '0':
             if driver:
                 driver.quit()
+            store.close()
             print("程序已退出。")
             break
             
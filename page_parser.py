@@ -0,0 +1,202 @@
+"""
+题目页面的离线解析模块。
+
+只依赖标准库的 html.parser，把整页 HTML（driver.page_source 或保存下来的 .html 文件）
+一次性解析为轻量的节点树，再在本地完成与 main.parse_questions 相同的题目提取规则，
+避免逐个元素调用 WebDriver 带来的大量往返请求。
+"""
+import re
+from html.parser import HTMLParser
+
+# 定义一个全局的字母表，用于根据顺序确定选项
+LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+# 没有结束标签的空元素
+VOID_TAGS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+})
+# 渲染后会独占一行的块级元素，用于模拟 Selenium 的 .text
+BLOCK_TAGS = frozenset({
+    "address", "article", "aside", "blockquote", "dd", "div", "dl", "dt",
+    "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3",
+    "h4", "h5", "h6", "header", "hr", "li", "main", "nav", "ol", "p", "pre",
+    "section", "table", "tr", "ul",
+})
+# 不会显示在页面上的元素
+HIDDEN_TAGS = frozenset({"script", "style", "template", "noscript", "head", "title"})
+
+_SPACES_RE = re.compile(r"[ \t\r\f\v\xa0]+")
+
+
+class Node:
+    """HTML 元素节点，children 中混合存放子 Node 与文本字符串。"""
+    __slots__ = ("tag", "classes", "children")
+
+    def __init__(self, tag, attrs=()):
+        self.tag = tag
+        self.classes = frozenset()
+        for name, value in attrs:
+            if name == "class" and value:
+                self.classes = frozenset(value.split())
+                break
+        self.children = []
+
+    def matches(self, tag=None, cls=None):
+        return (tag is None or self.tag == tag) and (cls is None or cls in self.classes)
+
+    def iter(self):
+        """按文档顺序遍历所有后代元素（不含自身）。"""
+        stack = [c for c in reversed(self.children) if isinstance(c, Node)]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(c for c in reversed(node.children) if isinstance(c, Node))
+
+    def find_all(self, tag=None, cls=None):
+        return [node for node in self.iter() if node.matches(tag, cls)]
+
+    def find(self, tag=None, cls=None):
+        """返回第一个匹配的后代元素，找不到时抛出 LookupError（对应 NoSuchElementException）。"""
+        for node in self.iter():
+            if node.matches(tag, cls):
+                return node
+        raise LookupError(f"找不到元素 {tag or ''}.{cls or ''}")
+
+    def child_elements(self, tag=None, cls=None):
+        return [c for c in self.children if isinstance(c, Node) and c.matches(tag, cls)]
+
+    def text_content(self):
+        """等价于 DOM 的 textContent：所有文本节点原样拼接。"""
+        parts = []
+        stack = [self]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                parts.append(item)
+            else:
+                stack.extend(reversed(item.children))
+        return "".join(parts)
+
+    def visible_text(self):
+        """近似 Selenium 的 .text：忽略隐藏元素，合并空白，块级元素与 <br> 换行。"""
+        parts = []
+        stack = [self]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                parts.append(item.replace("\n", " "))
+            elif item.tag == "br":
+                parts.append("\n")
+            elif item.tag not in HIDDEN_TAGS:
+                if item.tag in BLOCK_TAGS:
+                    parts.append("\n")
+                    stack.append("\n")
+                stack.extend(reversed(item.children))
+        lines = (_SPACES_RE.sub(" ", line).strip() for line in "".join(parts).split("\n"))
+        return "\n".join(line for line in lines if line)
+
+
+class _TreeBuilder(HTMLParser):
+    """把 HTML 文本构建为 Node 树，容忍未闭合或多余的结束标签。"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node("#document")
+        self.stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        node = Node(tag, attrs)
+        self.stack[-1].children.append(node)
+        if tag not in VOID_TAGS:
+            self.stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        self.stack[-1].children.append(Node(tag, attrs))
+
+    def handle_endtag(self, tag):
+        for depth in range(len(self.stack) - 1, 0, -1):
+            if self.stack[depth].tag == tag:
+                del self.stack[depth:]
+                return
+
+    def handle_data(self, data):
+        self.stack[-1].children.append(data)
+
+
+def build_tree(html):
+    """解析整页 HTML，返回文档根节点。"""
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+def parse_question_element(q_node):
+    """
+    从单个 questionLi 节点中提取题目，规则与 main.parse_questions 的逐元素版本一致。
+    """
+    mark_name = next((h3 for h3 in q_node.find_all("h3", "mark_name")
+                      if h3.child_elements("span", "colorShallow")), None)
+    if mark_name is None:
+        raise LookupError("找不到元素 h3.mark_name > span.colorShallow")
+    q_type = mark_name.child_elements("span", "colorShallow")[0].visible_text().strip('()')
+    full_stem_text = q_node.find("h3", "mark_name").text_content().strip()
+    q_stem = ')'.join(full_stem_text.split(')')[1:]).strip()
+
+    correct_answer_letters = []
+    try:
+        mark_key_div = q_node.find("div", "mark_key")
+        for span in mark_key_div.find_all("span"):
+            span_text = span.text_content()
+            if "正确答案:" in span_text:
+                answer_text = span_text.replace('正确答案:', '').strip()
+                if answer_text:
+                    correct_answer_letters = list(answer_text)
+                break
+    except LookupError:
+        pass
+
+    options_list = []
+    option_nodes = [opt for stem_answer in q_node.find_all("div", "stem_answer")
+                    for opt in stem_answer.child_elements("div", "clearfix")]
+    for index, opt_node in enumerate(option_nodes):
+        option_letter = LETTERS[index]
+        option_text = opt_node.find("div", "answer_p").visible_text()
+        is_correct = option_letter in correct_answer_letters
+        options_list.append((option_text, is_correct))
+
+    return {
+        "type": q_type,
+        "stem": q_stem,
+        "options": options_list
+    }
+
+
+def extract_questions(html):
+    """
+    从整页 HTML 中提取所有题目。
+
+    返回 (题目列表, 错误信息列表, 找到的 questionLi 数量)，单道题解析失败不会中断整体解析。
+    """
+    root = build_tree(html)
+    question_nodes = root.find_all(cls="questionLi")
+    questions, errors = [], []
+    for q_node in question_nodes:
+        try:
+            questions.append(parse_question_element(q_node))
+        except Exception as e:
+            errors.append(f"解析某道题目时出错: {e}")
+    return questions, errors, len(question_nodes)
+
+
+def parse_html_file(path):
+    """
+    读取并解析一个保存下来的题目页面文件，供进程池调用。
+
+    返回 (文件路径, 题目列表, 错误信息列表, 找到的 questionLi 数量)。
+    """
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        html = f.read()
+    questions, errors, found_count = extract_questions(html)
+    return path, questions, errors, found_count
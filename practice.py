@@ -0,0 +1,167 @@
+"""
+练习记录与间隔复习抽题。
+
+每道题（以归一化题干为键）记录 [作答次数, 答错次数, 上次作答时间]，保存在题库旁的
+<题库文件>.history.json 中。智能复习模式按复习权重抽题：答错越多、距上次作答越久的题
+权重越大，刚做过的题暂时降低权重。权重保存在树状数组(Fenwick 树)中，单题更新和单次
+抽样都是 O(log n)，每次测验后只更新做过的题，无需重建全部权重。
+
+只依赖标准库。
+"""
+import json
+import math
+import os
+import random
+import time
+
+from bank_store import BankFormatError, _atomic_write_text
+from normalize import normalize_stems
+
+HISTORY_SUFFIX = ".history.json"
+HISTORY_VERSION = 1
+# 从未做过的题的权重
+NEW_WEIGHT = 3.0
+# 刚作答过的题权重降为原来的 10%，之后按该半衰期(天)逐渐恢复
+RECENT_HALF_LIFE_DAYS = 1.0
+
+
+def history_path(db_filename):
+    return db_filename + HISTORY_SUFFIX
+
+
+def question_keys(questions):
+    """题库中每道题的历史记录键（归一化题干）。.xqb 题库只解码题干。"""
+    stem_of = getattr(questions, 'stem', None)
+    if callable(stem_of):
+        stems = [stem_of(i) for i in range(len(questions))]
+    else:
+        stems = [q['stem'] for q in questions]
+    return normalize_stems(stems)
+
+
+def review_weight(record, now):
+    """根据作答记录计算复习权重，记录为 None 表示从未做过。"""
+    if record is None:
+        return NEW_WEIGHT
+    attempts, errors, last_seen = record
+    # 加一平滑的错误率，只做过一两次的题不会被判为 0 或 1
+    error_rate = (errors + 1) / (attempts + 2)
+    days = max(now - last_seen, 0) / 86400
+    recency = 1 - 0.9 * math.pow(0.5, days / RECENT_HALF_LIFE_DAYS)
+    return (0.2 + 4 * error_rate) * recency
+
+
+class PracticeHistory:
+    """按题目键保存的作答记录。"""
+
+    def __init__(self, path, records=None):
+        self.path = path
+        self.records = records if records is not None else {}
+
+    @classmethod
+    def load(cls, path):
+        """读取记录文件，文件不存在时返回空记录。"""
+        if not os.path.exists(path):
+            return cls(path)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            records = data['questions']
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            raise BankFormatError(f"练习记录文件 '{path}' 格式不正确: {e}") from e
+        return cls(path, records)
+
+    def get(self, key):
+        return self.records.get(key)
+
+    def record(self, key, correct, now=None):
+        """记录一次作答。"""
+        rec = self.records.setdefault(key, [0, 0, 0])
+        rec[0] += 1
+        rec[1] += not correct
+        rec[2] = int(now if now is not None else time.time())
+
+    def save(self):
+        data = {"version": HISTORY_VERSION, "questions": self.records}
+        _atomic_write_text(self.path, lambda f: json.dump(data, f, ensure_ascii=False, separators=(',', ':')))
+
+
+class WeightedSampler:
+    """
+    基于树状数组的加权抽样：update 与 sample 中的每次抽取均为 O(log n)。
+    """
+
+    def __init__(self, weights):
+        n = len(weights)
+        self._weights = [float(w) for w in weights]
+        tree = [0.0] * (n + 1)
+        # O(n) 建树：每个结点把自己的和加到父结点
+        for i, w in enumerate(self._weights, 1):
+            tree[i] += w
+            parent = i + (i & -i)
+            if parent <= n:
+                tree[parent] += tree[i]
+        self._tree = tree
+        self._top = 1 << (n.bit_length() - 1) if n else 0
+
+    def __len__(self):
+        return len(self._weights)
+
+    def weight(self, index):
+        return self._weights[index]
+
+    def total(self):
+        total = 0.0
+        i = len(self._weights)
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def update(self, index, weight):
+        """修改第 index 项的权重。"""
+        weight = float(weight)
+        delta = weight - self._weights[index]
+        self._weights[index] = weight
+        i = index + 1
+        n = len(self._weights)
+        while i <= n:
+            self._tree[i] += delta
+            i += i & -i
+
+    def _find(self, target):
+        """返回前缀和首次超过 target 的下标。"""
+        pos = 0
+        step = self._top
+        n = len(self._weights)
+        while step:
+            nxt = pos + step
+            if nxt <= n and self._tree[nxt] <= target:
+                target -= self._tree[nxt]
+                pos = nxt
+            step >>= 1
+        return min(pos, n - 1)
+
+    def sample(self, k, rng=random):
+        """
+        按权重不放回地抽取 k 个下标（权重为 0 的项不会被抽中，数量可能少于 k）。
+
+        抽中的项临时置零，抽完后恢复原权重。
+        """
+        chosen = []
+        removed = []
+        try:
+            while len(chosen) < k:
+                total = self.total()
+                if total <= 1e-9:
+                    break
+                index = self._find(rng.random() * total)
+                if self._weights[index] <= 0:
+                    break  # 剩余总权重只是浮点误差
+                chosen.append(index)
+                removed.append((index, self._weights[index]))
+                self.update(index, 0.0)
+        finally:
+            for index, weight in reversed(removed):
+                self.update(index, weight)
+        return chosen
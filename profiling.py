@@ -0,0 +1,144 @@
+"""
+main.py 的可选性能剖析（--profile）。
+
+按阶段记录耗时、题库在阶段前后的题目数、阶段内处理的题目数，以及 WebDriver 命令的
+次数与耗时（通过包装 driver.execute 统计，页面元素的所有操作最终都经过它），
+退出时打印汇总表，并可写出 JSON 追踪文件。
+
+未开启时使用 NULL_PROFILER：stage() 直接返回共享的空上下文，也不包装 driver，
+不产生任何额外开销。只依赖标准库。
+"""
+import contextlib
+import json
+import time
+
+
+class StageRecord:
+    """一个阶段的一次执行。"""
+    __slots__ = ("name", "start", "seconds", "bank_before", "bank_after", "items", "commands", "command_seconds")
+
+    def __init__(self, name, start, bank_before):
+        self.name = name
+        self.start = start
+        self.seconds = 0.0
+        self.bank_before = bank_before
+        self.bank_after = None
+        self.items = None  # 阶段内处理的题目数，由调用方填写
+        self.commands = {}
+        self.command_seconds = 0.0
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class _NullRecord:
+    """关闭剖析时 stage() 返回的记录，对它的赋值会被忽略。"""
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        pass
+
+
+class NullProfiler:
+    enabled = False
+    _context = contextlib.nullcontext(_NullRecord())
+
+    def stage(self, name, bank=None):
+        return self._context
+
+    def instrument_driver(self, driver):
+        return driver
+
+    def report(self, trace_filename=None):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class Profiler:
+    enabled = True
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.records = []
+        self._commands = {}
+        self._command_seconds = 0.0
+
+    @contextlib.contextmanager
+    def stage(self, name, bank=None):
+        """
+        记录一个阶段。bank 为题库对象时记录阶段前后的题目数。
+
+        用法: with profiler.stage("合并去重", question_bank) as record: record.items = n
+        """
+        commands_before = dict(self._commands)
+        command_seconds_before = self._command_seconds
+        record = StageRecord(name, time.perf_counter() - self.origin, len(bank) if bank is not None else None)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds = time.perf_counter() - start
+            if bank is not None:
+                record.bank_after = len(bank)
+            record.commands = {cmd: count - commands_before.get(cmd, 0)
+                               for cmd, count in self._commands.items()
+                               if count != commands_before.get(cmd, 0)}
+            record.command_seconds = self._command_seconds - command_seconds_before
+            self.records.append(record)
+
+    def instrument_driver(self, driver):
+        """包装 driver.execute，统计每种 WebDriver 命令的次数和耗时。"""
+        execute = driver.execute
+
+        def counting_execute(driver_command, params=None):
+            start = time.perf_counter()
+            try:
+                return execute(driver_command, params)
+            finally:
+                self._command_seconds += time.perf_counter() - start
+                self._commands[driver_command] = self._commands.get(driver_command, 0) + 1
+
+        driver.execute = counting_execute
+        return driver
+
+    def summary_rows(self):
+        """按阶段名汇总（菜单中同一操作可能执行多次）。"""
+        rows = {}
+        for record in self.records:
+            row = rows.setdefault(record.name, {
+                "stage": record.name, "runs": 0, "seconds": 0.0, "items": 0,
+                "commands": 0, "command_seconds": 0.0, "bank_before": record.bank_before, "bank_after": None,
+            })
+            row["runs"] += 1
+            row["seconds"] += record.seconds
+            row["items"] += record.items or 0
+            row["commands"] += sum(record.commands.values())
+            row["command_seconds"] += record.command_seconds
+            row["bank_after"] = record.bank_after
+        return list(rows.values())
+
+    def report(self, trace_filename=None):
+        """打印汇总表，指定文件名时写出 JSON 追踪。"""
+        rows = self.summary_rows()
+        if rows:
+            print("\n" + "=" * 20 + " 性能剖析 " + "=" * 20)
+            print(f"{'阶段':<10}{'次数':>6}{'耗时(s)':>10}{'题目数':>8}{'WebDriver命令':>15}"
+                  f"{'命令耗时(s)':>12}{'每题命令':>10}  题库(前→后)")
+            for row in rows:
+                per_question = f"{row['commands'] / row['items']:.1f}" if row['items'] and row['commands'] else "-"
+                bank = "-" if row['bank_before'] is None else f"{row['bank_before']}→{row['bank_after']}"
+                print(f"{row['stage']:<10}{row['runs']:>6}{row['seconds']:>10.3f}{row['items'] or '-':>8}"
+                      f"{row['commands'] or '-':>15}{row['command_seconds']:>12.3f}{per_question:>10}  {bank}")
+            total = time.perf_counter() - self.origin
+            print(f"总运行时间 {total:.3f} 秒（含等待用户输入的时间）。")
+        if trace_filename:
+            trace = {
+                "total_seconds": time.perf_counter() - self.origin,
+                "stages": [record.to_dict() for record in self.records],
+                "summary": rows,
+            }
+            with open(trace_filename, 'w', encoding='utf-8') as f:
+                json.dump(trace, f, ensure_ascii=False, indent=2)
+            print(f"性能追踪已写入 '{trace_filename}'。")
@@ -0,0 +1,182 @@
+"""
+main.py 与 test.py 共用的题目内存模型。
+
+题库文件中的每道题是 {"type", "stem", "options": [[文本, 是否正确], ...]} 形式的字典，
+在内存中则统一转换为紧凑的 Question：
+- 使用 __slots__，不为每个对象分配 __dict__；
+- 题型字符串经 sys.intern 驻留，全库只保留一份；
+- 选项文本存为元组，正确答案存为整数位掩码（第 i 位为 1 表示第 i 个选项正确）。
+"""
+import sys
+
+from normalize import normalize_stems
+from page_parser import LETTERS
+
+
+class Question:
+    """一道题目。"""
+    __slots__ = ("type", "stem", "options", "answer_mask")
+
+    def __init__(self, q_type, stem, options, answer_mask):
+        self.type = sys.intern(q_type)
+        self.stem = stem
+        self.options = tuple(options)
+        self.answer_mask = answer_mask
+
+    @classmethod
+    def from_dict(cls, item):
+        """从题库中的字典（选项为 [文本, 是否正确] 或元组）构造。"""
+        answer_mask = 0
+        texts = []
+        for i, (text, is_correct) in enumerate(item['options']):
+            texts.append(text)
+            if is_correct:
+                answer_mask |= 1 << i
+        return cls(item['type'], item['stem'], texts, answer_mask)
+
+    def to_dict(self):
+        """转换回题库文件使用的字典格式。"""
+        return {"type": self.type, "stem": self.stem, "options": [list(pair) for pair in self.iter_options()]}
+
+    def is_correct(self, index):
+        return bool(self.answer_mask >> index & 1)
+
+    def iter_options(self):
+        """依次返回 (选项文本, 是否正确)。"""
+        for i, text in enumerate(self.options):
+            yield text, bool(self.answer_mask >> i & 1)
+
+    @property
+    def correct_indices(self):
+        return [i for i in range(len(self.options)) if self.answer_mask >> i & 1]
+
+    @property
+    def answer_letters(self):
+        return ''.join(LETTERS[i] for i in self.correct_indices)
+
+    def check(self, selected_indices):
+        """判断所选选项下标是否与正确答案完全一致。"""
+        selected_mask = 0
+        for i in selected_indices:
+            selected_mask |= 1 << i
+        return selected_mask == self.answer_mask
+
+    def __repr__(self):
+        return f"Question({self.type!r}, {self.stem[:20]!r}, answer={self.answer_letters!r})"
+
+
+class QuestionBank:
+    """
+    有序的题目集合，按题干 O(1) 查找。
+
+    同时维护归一化题干到题目的索引与近似重复索引（首次需要时才构建，之后随新增题目增量更新），
+    用于去重合并。
+    由 .xqb 的 CompiledBank 构造时不会立即解码：题目在首次按下标访问时才解码，
+    题干索引只通过 CompiledBank.stem() 解码题干。
+    """
+
+    def __init__(self, questions=()):
+        self._source = None  # 延迟解码的 CompiledBank
+        self._questions = list(questions)
+        self._by_stem = None  # 原始题干 -> 下标
+        self._keys = None  # 各题的归一化题干
+        self._by_key = None  # 归一化题干 -> 下标
+        self._near_dup = None  # dedup.NearDuplicateIndex
+
+    @classmethod
+    def from_dicts(cls, items):
+        if callable(getattr(items, 'stem', None)):
+            bank = cls()
+            bank._source = items
+            bank._questions = [None] * len(items)
+            return bank
+        return cls(Question.from_dict(item) for item in items)
+
+    def to_dicts(self):
+        return [question.to_dict() for question in self]
+
+    def __len__(self):
+        return len(self._questions)
+
+    def __iter__(self):
+        for i in range(len(self._questions)):
+            yield self[i]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._questions)))]
+        question = self._questions[index]
+        if question is None:
+            question = self._questions[index] = Question.from_dict(self._source[index % len(self._questions)])
+        return question
+
+    def stems(self):
+        """所有题干；延迟加载的题库只解码题干，不解码选项。"""
+        return [q.stem if q is not None else self._source.stem(i) for i, q in enumerate(self._questions)]
+
+    def _stem_index(self):
+        if self._by_stem is None:
+            self._by_stem = {}
+            for i, stem in enumerate(self.stems()):
+                self._by_stem.setdefault(stem, i)
+        return self._by_stem
+
+    def get(self, stem, default=None):
+        """按原始题干查找题目。"""
+        index = self._stem_index().get(stem)
+        return default if index is None else self[index]
+
+    def replace(self, index, question):
+        """
+        用内容更新后的题目替换第 index 题（归一化题干须相同，例如更正了答案）。
+        """
+        old_stem = self[index].stem
+        self._questions[index] = question
+        by_stem = self._stem_index()
+        if by_stem.get(old_stem) == index:
+            del by_stem[old_stem]
+        by_stem.setdefault(question.stem, index)
+
+    def _normalized_keys(self):
+        if self._keys is None:
+            self._keys = normalize_stems(self.stems())
+        return self._keys
+
+    def _key_index(self):
+        if self._by_key is None:
+            self._by_key = {}
+            for i, key in enumerate(self._normalized_keys()):
+                self._by_key.setdefault(key, i)
+        return self._by_key
+
+    def near_duplicate_index(self, threshold, count=None):
+        """
+        前 count 道题（默认全部）的近似重复索引。
+
+        索引保存在题库中，尚未加入的题目在调用时增量加入，多次合并不必重新计算整个题库的签名。
+        """
+        from dedup import NearDuplicateIndex
+
+        if self._near_dup is None:
+            self._near_dup = NearDuplicateIndex(threshold=threshold)
+        self._near_dup.threshold = threshold
+        count = len(self._questions) if count is None else count
+        if len(self._near_dup) < count:
+            self._near_dup.add(self._normalized_keys()[len(self._near_dup):count], normalized=True)
+        return self._near_dup
+
+    def add_new(self, questions):
+        """
+        追加归一化题干尚不存在的题目，返回实际新增的题目列表。
+        """
+        by_key = self._key_index()
+        by_stem = self._stem_index()
+        added = []
+        for key, question in zip(normalize_stems([q.stem for q in questions]), questions):
+            if key not in by_key:
+                by_key[key] = len(self._questions)
+                self._keys.append(key)
+                by_stem.setdefault(question.stem, len(self._questions))
+                self._questions.append(question)
+                added.append(question)
+        return added
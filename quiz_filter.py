@@ -0,0 +1,139 @@
+"""
+测验抽题范围的筛选索引。
+
+加载题库时一次性建立：
+- 题型 -> 题目下标列表；
+- 归一化题干的字符二元组(bigram)倒排表，编码方式与 search.py 的检索索引相同，
+  关键词筛选只对关键词中各二元组的倒排表求交，再核对少量候选题目，不必扫描整个题库；
+- 答错过的题目下标集合，作答后增量更新。
+
+倒排表用 numpy 建立，numpy 在建立索引时才导入。
+"""
+from normalize import normalize_stem
+
+_SEP = '\0'
+_CHAR_BITS = 21
+
+
+def question_types(questions):
+    """题库中每道题的题型。.xqb 题库只解码题型。"""
+    type_of = getattr(questions, 'question_type', None)
+    if callable(type_of):
+        return [type_of(i) for i in range(len(questions))]
+    return [q['type'] for q in questions]
+
+
+class QuizFilterIndex:
+    """按题型、题干关键词和“答错过”筛选题目下标。"""
+
+    def __init__(self, types, keys, history=None):
+        """
+        :param types: 每道题的题型
+        :param keys: 每道题的归一化题干（与练习记录的键相同）
+        :param history: PracticeHistory，用于找出答错过的题
+        """
+        self._count = len(keys)
+        self.by_type = {}
+        for i, q_type in enumerate(types):
+            self.by_type.setdefault(q_type, []).append(i)
+
+        self._keys = keys
+        self._build_grams(keys)
+
+        self.wrong = set()
+        if history is not None:
+            for i, key in enumerate(keys):
+                record = history.get(key)
+                if record is not None and record[1] > 0:
+                    self.wrong.add(i)
+
+    def _build_grams(self, keys):
+        """
+        建立按 (二元组, 题目下标) 排序并去重的倒排数组。
+
+        各题干以分隔符拼接，二元组编码为 (前一字符码点 << 21) | 后一字符码点；
+        题干最后一个字符与分隔符组成 (码点 << 21) | 0，使单字关键词同样可以检索。
+        """
+        import numpy as np
+
+        text = ''.join(key + _SEP for key in keys)
+        cps = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+        lengths = np.fromiter((len(key) + 1 for key in keys), dtype=np.int64, count=len(keys))
+        doc_ids = np.repeat(np.arange(len(keys), dtype=np.int32), lengths)[:-1]
+        grams = (cps[:-1] << np.uint64(_CHAR_BITS)) | cps[1:]
+        keep = cps[:-1] != 0
+        grams, doc_ids = grams[keep], doc_ids[keep]
+        doc_bits = max(len(keys) - 1, 1).bit_length()
+        if 2 * _CHAR_BITS + doc_bits <= 64:
+            # 把 (二元组, 下标) 拼成一个整数排序，比 lexsort 快一个数量级
+            pairs = np.sort((grams << np.uint64(doc_bits)) | doc_ids.astype(np.uint64))
+            if len(pairs):
+                pairs = pairs[np.concatenate(([True], pairs[1:] != pairs[:-1]))]
+            grams = pairs >> np.uint64(doc_bits)
+            doc_ids = (pairs & np.uint64((1 << doc_bits) - 1)).astype(np.int32)
+        else:
+            order = np.lexsort((doc_ids, grams))
+            grams, doc_ids = grams[order], doc_ids[order]
+            unique = np.ones(len(grams), dtype=bool)
+            unique[1:] = (grams[1:] != grams[:-1]) | (doc_ids[1:] != doc_ids[:-1])
+            grams, doc_ids = grams[unique], doc_ids[unique]
+        self._grams, self._doc_ids = grams, doc_ids
+
+    @property
+    def types(self):
+        return list(self.by_type)
+
+    def mark_wrong(self, index):
+        self.wrong.add(index)
+
+    def keyword_indices(self, keyword):
+        """题干（归一化后）包含关键词的题目下标，按升序排列。"""
+        needle = normalize_stem(keyword)
+        if not needle:
+            return range(self._count)
+        import numpy as np
+
+        cps = [ord(char) for char in needle]
+        if len(cps) == 1:
+            # 单字匹配所有以该字开头的二元组，同一题可能出现多次
+            bounds = np.array([cps[0] << _CHAR_BITS, (cps[0] + 1) << _CHAR_BITS], dtype=np.uint64)
+            lo, hi = np.searchsorted(self._grams, bounds)
+            hits = np.zeros(self._count, dtype=bool)
+            hits[self._doc_ids[lo:hi]] = True
+            return np.flatnonzero(hits).tolist()
+
+        postings = []
+        for gram in {(a << _CHAR_BITS) | b for a, b in zip(cps, cps[1:])}:
+            lo, hi = np.searchsorted(self._grams, np.array([gram, gram + 1], dtype=np.uint64))
+            if lo == hi:
+                return []
+            postings.append(self._doc_ids[lo:hi])
+        # 从最短的倒排表出发逐个求交
+        postings.sort(key=len)
+        found = postings[0]
+        for ids in postings[1:]:
+            found = np.intersect1d(found, ids, assume_unique=True)
+        found = found.tolist()
+        # 含有全部二元组不代表连续出现，最后核对候选题目
+        if len(cps) > 2:
+            found = [i for i in found if needle in self._keys[i]]
+        return found
+
+    def select(self, q_type=None, keyword="", only_wrong=False):
+        """返回同时满足各条件的题目下标（升序）。没有任何条件时返回整个题库的 range。"""
+        candidates = []
+        if q_type:
+            candidates.append(self.by_type.get(q_type, []))
+        if keyword.strip():
+            candidates.append(self.keyword_indices(keyword))
+        if only_wrong:
+            candidates.append(sorted(self.wrong))
+        if not candidates:
+            return range(self._count)
+        # 从最小的集合出发逐个求交
+        candidates.sort(key=len)
+        result = candidates[0]
+        for other in candidates[1:]:
+            other = set(other)
+            result = [i for i in result if i in other]
+        return result
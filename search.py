@@ -0,0 +1,231 @@
+"""
+题库全文检索模块。
+
+对题干与选项文本（归一化后）建立字符二元组(bigram)倒排索引，并持久化到题库旁的
+.search-index 文件中。倒排表以按二元组排序的 numpy 数组保存，查询只需二分查找；
+题库变化时只为新增或修改过的题目追加倒排项，删除的题目先标记为失效，
+失效过多时再整体压缩。索引同时记录建立时题库文件的大小与修改时间，
+两者都没变时直接使用索引，不再逐题比较。
+"""
+import hashlib
+import io
+import os
+
+import numpy as np
+
+from normalize import normalize_stems
+
+INDEX_SUFFIX = ".search-index"
+INDEX_VERSION = 1
+# 失效文档占比超过该值时重建索引
+COMPACT_RATIO = 0.5
+
+_SEP = '\0'
+_CHAR_BITS = np.uint64(21)
+
+
+def question_segments(question):
+    """参与检索的文本片段：题干与各个选项。"""
+    return [question.stem, *question.options]
+
+
+def question_fingerprint(question):
+    """题目内容的64位摘要，用于判断题目是否被修改过。"""
+    payload = _SEP.join([question.type, question.stem] +
+                        [f"{text}\1{int(is_correct)}" for text, is_correct in question.iter_options()])
+    return int.from_bytes(hashlib.blake2b(payload.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def _codepoints(text):
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+
+
+def _bigram_pairs(documents, first_doc_id):
+    """
+    把一批文档（每个文档是若干文本片段）切分为 (二元组, 文档编号) 对，按二元组排序并去重。
+
+    各片段归一化后以分隔符拼接，二元组编码为 (前一字符码点 << 21) | 后一字符码点；
+    片段最后一个字符与分隔符组成 (码点 << 21) | 0，使单字文本和单字查询同样可以检索。
+    """
+    if not documents:
+        return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int32)
+    normalized = normalize_stems([segment for segments in documents for segment in segments])
+    segment_counts = [len(segments) for segments in documents]
+    segment_lengths = np.fromiter((len(seg) + 1 for seg in normalized), dtype=np.int64, count=len(normalized))
+    segment_docs = np.repeat(np.arange(first_doc_id, first_doc_id + len(documents), dtype=np.int32), segment_counts)
+    cps = _codepoints(''.join(seg + _SEP for seg in normalized))
+    grams = (cps[:-1] << _CHAR_BITS) | cps[1:]
+    doc_ids = np.repeat(segment_docs, segment_lengths)[:-1]
+    keep = cps[:-1] != 0
+    grams, doc_ids = grams[keep], doc_ids[keep]
+    order = np.lexsort((doc_ids, grams))
+    grams, doc_ids = grams[order], doc_ids[order]
+    unique = np.ones(len(grams), dtype=bool)
+    unique[1:] = (grams[1:] != grams[:-1]) | (doc_ids[1:] != doc_ids[:-1])
+    return grams[unique], doc_ids[unique]
+
+
+class SearchIndex:
+    """字符二元组倒排索引，文档编号只增不减，删除的编号在压缩前不会复用。"""
+
+    def __init__(self):
+        self.stems = []          # 编号 -> 题干，失效文档为 None
+        self.fingerprints = []   # 编号 -> 内容摘要
+        self.stem_to_id = {}
+        self.grams = np.empty(0, dtype=np.uint64)
+        self.doc_ids = np.empty(0, dtype=np.int32)
+        self.source = None       # 同步时题库文件的 [大小, 修改时间(纳秒)]
+        self._alive = None
+
+    def __len__(self):
+        return len(self.stem_to_id)
+
+    def _append(self, questions):
+        first_doc_id = len(self.stems)
+        for offset, question in enumerate(questions):
+            self.stems.append(question.stem)
+            self.fingerprints.append(question_fingerprint(question))
+            self.stem_to_id[question.stem] = first_doc_id + offset
+        grams, doc_ids = _bigram_pairs([question_segments(q) for q in questions], first_doc_id)
+        if len(self.grams):
+            # 新倒排项已排序，按位置插入，不重新排序整个索引；新编号更大，排在同一二元组的已有项之后
+            positions = np.searchsorted(self.grams, grams, side='right')
+            grams = np.insert(self.grams, positions, grams)
+            doc_ids = np.insert(self.doc_ids, positions, doc_ids)
+        self.grams, self.doc_ids = grams, doc_ids
+
+    def sync(self, question_bank):
+        """
+        使索引与题库保持一致，只处理新增、删除和内容变化的题目。
+
+        返回 (新增或更新的数量, 删除的数量)。
+        """
+        current = {q.stem: q for q in question_bank}
+        removed = [stem for stem in self.stem_to_id if stem not in current]
+        pending = []
+        for stem, question in current.items():
+            doc_id = self.stem_to_id.get(stem)
+            if doc_id is None or self.fingerprints[doc_id] != question_fingerprint(question):
+                pending.append(question)
+        for stem in removed + [q.stem for q in pending]:
+            doc_id = self.stem_to_id.pop(stem, None)
+            if doc_id is not None:
+                self.stems[doc_id] = None
+        self._alive = None
+
+        if len(self.stems) - len(self.stem_to_id) > COMPACT_RATIO * len(self.stems):
+            # 失效文档过多，按当前题库从头重建
+            self.__init__()
+            self._append(list(current.values()))
+        elif pending:
+            self._append(pending)
+        return len(pending), len(removed)
+
+    def search(self, query, limit=10):
+        """
+        返回最相关的题目题干，结果为 [(得分, 题干), ...]。
+
+        得分为命中的查询二元组的 IDF 之和除以查询的总 IDF，完全命中时为 1。
+        单字查询会匹配所有以该字开头的二元组。
+        """
+        normalized = normalize_stems([query])[0]
+        if not normalized or not self.stem_to_id:
+            return []
+        cps = _codepoints(normalized)
+        if len(cps) == 1:
+            ranges = [(cps[0] << _CHAR_BITS, (cps[0] + np.uint64(1)) << _CHAR_BITS)]
+        else:
+            grams = np.unique((cps[:-1] << _CHAR_BITS) | cps[1:])
+            ranges = [(g, g + np.uint64(1)) for g in grams]
+
+        lows, highs = np.array(ranges, dtype=np.uint64).T
+        los = np.searchsorted(self.grams, lows, side='left')
+        his = np.searchsorted(self.grams, highs, side='left')
+        if len(cps) == 1:
+            # 同一文档可能有多个以该字开头的二元组，去重后每个文档只计一次，文档频率也按去重后的数量
+            hits = np.unique(self.doc_ids[los[0]:his[0]])
+            counts = np.array([len(hits)])
+        else:
+            counts = his - los
+            hits = np.concatenate([self.doc_ids[lo:hi] for lo, hi in zip(los, his)])
+        if not counts.any():
+            return []
+        weights = np.log1p(len(self.stem_to_id) / (1 + counts))
+        scores = np.bincount(hits, np.repeat(weights, counts), minlength=len(self.stems))
+        if self._alive is None:
+            self._alive = np.fromiter((stem is not None for stem in self.stems), dtype=bool, count=len(self.stems))
+        scores[~self._alive] = 0
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        candidates = candidates[np.lexsort((candidates, -scores[candidates]))]
+        total_weight = weights.sum()
+        return [(float(scores[i] / total_weight), self.stems[i]) for i in candidates]
+
+    def save(self, path):
+        stems_blob = _SEP.join('' if stem is None else stem for stem in self.stems).encode('utf-8')
+        buffer = io.BytesIO()
+        np.savez(
+            buffer,
+            version=np.array([INDEX_VERSION]),
+            grams=self.grams,
+            doc_ids=self.doc_ids,
+            fingerprints=np.array(self.fingerprints, dtype=np.uint64),
+            alive=np.array([stem is not None for stem in self.stems], dtype=bool),
+            stems=np.frombuffer(stems_blob, dtype=np.uint8),
+            source=np.array(self.source or [], dtype=np.int64),
+        )
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(buffer.getbuffer())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            if int(data['version'][0]) != INDEX_VERSION:
+                raise ValueError("索引文件版本不匹配")
+            index = cls()
+            index.grams = data['grams']
+            index.doc_ids = data['doc_ids']
+            index.fingerprints = data['fingerprints'].tolist()
+            alive = data['alive'].tolist()
+            # 旧版索引没有记录题库文件信息，按题库已变化处理
+            if 'source' in data.files and len(data['source']):
+                index.source = data['source'].tolist()
+            stems = data['stems'].tobytes().decode('utf-8').split(_SEP) if len(alive) else []
+        index.stems = [stem if is_alive else None for stem, is_alive in zip(stems, alive)]
+        index.stem_to_id = {stem: i for i, stem in enumerate(index.stems) if stem is not None}
+        return index
+
+
+def _bank_stamp(db_filename):
+    """题库文件的 [大小, 修改时间(纳秒)]，文件不存在时返回 None。"""
+    try:
+        stat = os.stat(db_filename)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def open_search_index(db_filename, question_bank):
+    """
+    加载题库对应的持久化索引并增量同步，必要时写回磁盘。
+
+    题库文件的大小与修改时间都与索引中记录的相同时跳过同步，打开索引不必遍历题库；
+    索引文件缺失或损坏时会从头重建。
+    """
+    index_path = db_filename + INDEX_SUFFIX
+    stamp = _bank_stamp(db_filename)
+    try:
+        index = SearchIndex.load(index_path)
+    except (OSError, ValueError, KeyError):
+        index = SearchIndex()
+    else:
+        if stamp is not None and index.source == stamp:
+            return index
+    updated, removed = index.sync(question_bank)
+    if updated or removed or index.source != stamp or not os.path.exists(index_path):
+        index.source = stamp
+        index.save(index_path)
+    return index
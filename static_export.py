@@ -0,0 +1,83 @@
+"""
+为 test.html 练习页面生成分片的静态题库。
+
+题库按原有顺序切成固定大小的分片，每个分片是 gzip 压缩的 JSON 数组（格式与 题库.json
+相同），文件名包含未压缩 JSON 的哈希，内容不变则文件名不变，可以被浏览器永久缓存；
+哈希不受 zlib 版本或 gzip 头部（如操作系统字节）的影响，在不同机器上重新生成也得到相同的文件名。
+题库只在末尾追加新题时，只有最后一个分片会变化。
+
+manifest.json 很小，记录题目总数、各题型数量以及每个分片的文件名和题数，
+页面先加载它，抽到某道题时才去下载对应的分片。
+
+仓库中的 shards/ 目录由 题库.json 生成，test.html 从中加载题目。题库更新后需要重新生成并一同提交：
+
+    python main.py --db 题库.json --build-shards
+
+只依赖标准库。
+"""
+import glob
+import gzip
+import hashlib
+import json
+import os
+
+from bank_store import _atomic_write_text
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+SHARD_PREFIX = "shard-"
+SHARD_SUFFIX = ".json.gz"
+DEFAULT_SHARD_SIZE = 200
+
+
+def _count_types(items):
+    counts = {}
+    for item in items:
+        counts[item['type']] = counts.get(item['type'], 0) + 1
+    return counts
+
+
+def encode_shard(items):
+    """
+    把一组题目编码为 JSON，返回 (未压缩的 JSON 字节, gzip 压缩后的字节)。mtime 固定为 0。
+    """
+    raw = json.dumps(items, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return raw, gzip.compress(raw, compresslevel=9, mtime=0)
+
+
+def build_shards(items, output_dir, shard_size=DEFAULT_SHARD_SIZE):
+    """
+    写出分片与 manifest.json，并删除不再被引用的旧分片。
+
+    :param items: 题目字典列表（题库文件格式）
+    :return: manifest 字典
+    """
+    if shard_size <= 0:
+        raise ValueError("分片大小必须为正数")
+    os.makedirs(output_dir, exist_ok=True)
+
+    shards = []
+    for start in range(0, len(items), shard_size):
+        chunk = items[start:start + shard_size]
+        raw, data = encode_shard(chunk)
+        filename = f"{SHARD_PREFIX}{hashlib.sha256(raw).hexdigest()[:16]}{SHARD_SUFFIX}"
+        path = os.path.join(output_dir, filename)
+        if not os.path.exists(path):
+            _atomic_write_text(path, lambda f: f.write(data), binary=True)
+        shards.append({"file": filename, "count": len(chunk), "types": _count_types(chunk)})
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "total": len(items),
+        "types": _count_types(items),
+        "shards": shards,
+    }
+    _atomic_write_text(os.path.join(output_dir, MANIFEST_NAME),
+                       lambda f: json.dump(manifest, f, ensure_ascii=False, indent=2))
+
+    # 清理旧分片
+    referenced = {shard["file"] for shard in shards}
+    for path in glob.glob(os.path.join(output_dir, f"{SHARD_PREFIX}*{SHARD_SUFFIX}")):
+        if os.path.basename(path) not in referenced:
+            os.remove(path)
+    return manifest
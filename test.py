@@ -1,14 +1,26 @@
 import tkinter as tk
 from tkinter import messagebox, ttk
-import json
+import bisect
+import itertools
 import random
+import sys
+import time
+from attempt_log import AttemptLog, attempts_path
+from bank_store import BankFormatError, open_bank
+from practice import PracticeHistory, WeightedSampler, history_path, question_keys, review_weight
+from question_model import Question
+from quiz_filter import QuizFilterIndex, question_types
+
+RESULT_ROW_HEIGHT = 170  # 结果回顾中每题的预估高度(像素)，行首次显示时按实际内容更新
+RESULT_ROW_GAP = 10  # 结果行之间的间距(像素)
 
 class QuizApp:
     """一个从JSON文件加载题目的Tkinter测验应用"""
 
-    def __init__(self, root):
+    def __init__(self, root, db_filename="题库.json"):
         """初始化应用"""
         self.root = root
+        self.db_filename = db_filename
         self.root.title("测验程序")
         self.root.geometry("800x600")
 
@@ -22,7 +34,14 @@ class QuizApp:
         
         # 初始化变量
         self.all_questions = []
+        self.question_keys = []
+        self.history = None
+        self.sampler = None  # 智能复习的加权抽样器，首次使用时创建
+        self.filter_index = None
+        self.attempt_log = AttemptLog(attempts_path(db_filename))
+        self.candidate_indices = []  # 当前筛选条件下可抽取的题目下标
         self.quiz_questions = []
+        self.quiz_indices = []
         self.user_answers = {}
         self.current_question_index = 0
         
@@ -38,16 +57,26 @@ class QuizApp:
             widget.destroy()
 
     def load_questions(self):
-        """从题库.json文件加载题目"""
+        """从题库文件加载题目（支持 .json / .jsonl / .sqlite）"""
+        store = open_bank(self.db_filename)
         try:
-            with open("题库.json", "r", encoding="utf-8") as f:
-                self.all_questions = json.load(f)
+            self.all_questions = store.load()
         except FileNotFoundError:
-            messagebox.showerror("错误", "未找到 '题库.json' 文件！\n请确保该文件与程序在同一目录下。")
+            messagebox.showerror("错误", f"未找到 '{self.db_filename}' 文件！\n请确保该文件与程序在同一目录下。")
             self.root.quit()
-        except json.JSONDecodeError:
-            messagebox.showerror("错误", "'题库.json' 文件格式不正确！")
+        except BankFormatError:
+            messagebox.showerror("错误", f"'{self.db_filename}' 文件格式不正确！")
             self.root.quit()
+        finally:
+            store.close()
+
+        self.question_keys = question_keys(self.all_questions)
+        try:
+            self.history = PracticeHistory.load(history_path(self.db_filename))
+        except BankFormatError as e:
+            messagebox.showwarning("练习记录", f"{e}\n将使用新的练习记录。")
+            self.history = PracticeHistory(history_path(self.db_filename))
+        self.filter_index = QuizFilterIndex(question_types(self.all_questions), self.question_keys, self.history)
 
     def create_setup_frame(self):
         """创建用于设置题目数量的初始界面"""
@@ -57,71 +86,169 @@ class QuizApp:
 
         ttk.Label(setup_frame, text="欢迎来到测验程序", style="Header.TLabel").pack(pady=20)
         
-        info_text = f"题库中共有 {len(self.all_questions)} 道题。\n请输入要抽取的题目数量："
-        ttk.Label(setup_frame, text=info_text, justify=tk.CENTER).pack(pady=10)
+        # 抽题范围筛选
+        filter_frame = ttk.Frame(setup_frame)
+        filter_frame.pack(pady=10)
+        ttk.Label(filter_frame, text="题型:").pack(side="left")
+        self.type_var = tk.StringVar(value="全部")
+        ttk.Combobox(filter_frame, textvariable=self.type_var, values=["全部", *self.filter_index.types],
+                     state="readonly", width=8).pack(side="left", padx=(5, 15))
+        ttk.Label(filter_frame, text="题干关键词:").pack(side="left")
+        self.keyword_var = tk.StringVar()
+        ttk.Entry(filter_frame, textvariable=self.keyword_var, width=16).pack(side="left", padx=(5, 15))
+        self.only_wrong_filter_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(filter_frame, text="只抽答错过的题", variable=self.only_wrong_filter_var).pack(side="left")
+
+        self.info_label = ttk.Label(setup_frame, justify=tk.CENTER)
+        self.info_label.pack(pady=10)
+        for var in (self.type_var, self.keyword_var, self.only_wrong_filter_var):
+            var.trace_add("write", lambda *args: self.update_candidates())
+        self.update_candidates()
 
         self.num_questions_entry = ttk.Entry(setup_frame, width=10, font=("Helvetica", 12))
         self.num_questions_entry.pack(pady=5)
 
+        # 抽题方式
+        self.mode_var = tk.StringVar(value="random")
+        mode_frame = ttk.Frame(setup_frame)
+        mode_frame.pack(pady=10)
+        ttk.Radiobutton(mode_frame, text="随机抽题", variable=self.mode_var, value="random").pack(side="left", padx=10)
+        ttk.Radiobutton(mode_frame, text="智能复习（优先错题与久未练习的题）", variable=self.mode_var,
+                        value="review").pack(side="left", padx=10)
+
         start_button = ttk.Button(setup_frame, text="开始测验", command=self.start_quiz)
         start_button.pack(pady=20)
 
+    def update_candidates(self):
+        """按当前筛选条件更新可抽取的题目，并刷新题目数量提示"""
+        q_type = self.type_var.get()
+        self.candidate_indices = self.filter_index.select(
+            q_type=None if q_type == "全部" else q_type,
+            keyword=self.keyword_var.get(),
+            only_wrong=self.only_wrong_filter_var.get(),
+        )
+        if len(self.candidate_indices) == len(self.all_questions):
+            info_text = f"题库中共有 {len(self.all_questions)} 道题。\n请输入要抽取的题目数量："
+        else:
+            info_text = (f"题库中共有 {len(self.all_questions)} 道题，符合条件的有 {len(self.candidate_indices)} 道。"
+                         f"\n请输入要抽取的题目数量：")
+        self.info_label.configure(text=info_text)
+
     def start_quiz(self):
         """根据用户输入开始测验"""
+        candidates = self.candidate_indices
+        if not candidates:
+            messagebox.showwarning("没有题目", "没有符合筛选条件的题目。")
+            return
         try:
             num_to_draw = int(self.num_questions_entry.get())
-            if not (0 < num_to_draw <= len(self.all_questions)):
+            if not (0 < num_to_draw <= len(candidates)):
                 raise ValueError
         except ValueError:
-            messagebox.showwarning("输入无效", f"请输入一个介于1和{len(self.all_questions)}之间的数字。")
+            messagebox.showwarning("输入无效", f"请输入一个介于1和{len(candidates)}之间的数字。")
             return
         
-        # 随机抽取题目
-        self.quiz_questions = random.sample(self.all_questions, num_to_draw)
+        # 抽取题目下标，只把抽中的题目转换为 Question
+        if self.mode_var.get() == "review":
+            sampler = self.get_sampler()
+            if len(candidates) < len(self.all_questions):
+                # 只在筛选出的题目中按各自的复习权重抽取
+                sampler = WeightedSampler([sampler.weight(i) for i in candidates])
+                self.quiz_indices = [candidates[j] for j in sampler.sample(num_to_draw)]
+            else:
+                self.quiz_indices = sampler.sample(num_to_draw)
+        else:
+            self.quiz_indices = random.sample(candidates, num_to_draw)
+        self.quiz_questions = [Question.from_dict(self.all_questions[i]) for i in self.quiz_indices]
         self.user_answers = {} # 重置答案记录
         self.current_question_index = 0
         
+        self.build_quiz_frame()
         self.display_question()
 
-    def display_question(self):
-        """显示当前题目和选项"""
+    def get_sampler(self):
+        """返回按复习权重抽题的抽样器，只在第一次使用时计算全部权重"""
+        if self.sampler is None:
+            now = time.time()
+            self.sampler = WeightedSampler([review_weight(self.history.get(key), now) for key in self.question_keys])
+        return self.sampler
+
+    def record_history(self):
+        """把本次作答写入练习记录与作答日志，并只更新做过的题的抽样权重"""
+        now = int(time.time())
+        attempts = []
+        for quiz_index, (i, correct) in enumerate(zip(self.quiz_indices, self.result_correct)):
+            key = self.question_keys[i]
+            self.history.record(key, correct, now)
+            if not correct:
+                self.filter_index.mark_wrong(i)
+            if self.sampler is not None:
+                self.sampler.update(i, review_weight(self.history.get(key), now))
+            question = self.quiz_questions[quiz_index]
+            chosen_mask = sum(1 << option for option in self.user_answers.get(quiz_index, {}))
+            attempts.append((key, question.type, question.stem, chosen_mask, correct, now))
+        try:
+            self.history.save()
+            self.attempt_log.append(attempts)
+        except OSError as e:
+            messagebox.showwarning("练习记录", f"保存练习记录失败: {e}")
+
+    def build_quiz_frame(self):
+        """创建答题界面，整个测验过程中只创建一次，切换题目时仅更新内容"""
         self.clear_frame()
-        
-        # 获取当前题目数据
-        question_data = self.quiz_questions[self.current_question_index]
-        stem = question_data["stem"]
-        options = question_data["options"]
-        
+
         # 顶部进度条
-        progress_text = f"题目 {self.current_question_index + 1} / {len(self.quiz_questions)}"
-        ttk.Label(self.root, text=progress_text, style="Header.TLabel").pack(pady=(10, 20))
+        self.progress_label = ttk.Label(self.root, style="Header.TLabel")
+        self.progress_label.pack(pady=(10, 20))
 
         # 题干区域
         stem_frame = ttk.Frame(self.root, padding=(20, 10))
         stem_frame.pack(fill="x")
-        stem_label = ttk.Label(stem_frame, text=stem, wraplength=750, justify=tk.LEFT, style="Stem.TLabel")
-        stem_label.pack(anchor="w")
+        self.stem_label = ttk.Label(stem_frame, wraplength=750, justify=tk.LEFT, style="Stem.TLabel")
+        self.stem_label.pack(anchor="w")
 
-        # 选项区域
+        # 选项区域：复选框按需扩充，多余的隐藏起来留待复用
+        self.options_frame = ttk.Frame(self.root, padding=(40, 10))
+        self.options_frame.pack(fill="x")
+        self.option_pool = []  # [(复选框, BooleanVar), ...]
         self.option_vars = []
-        options_frame = ttk.Frame(self.root, padding=(40, 10))
-        options_frame.pack(fill="x")
-        
-        for i, option_data in enumerate(options):
-            option_text = option_data[0]
-            var = tk.BooleanVar()
-            
-            # 检查之前是否已保存答案
-            if self.user_answers.get(self.current_question_index, {}).get(i, False):
-                var.set(True)
-            
-            self.option_vars.append(var)
-            
-            cb = ttk.Checkbutton(options_frame, text=option_text, variable=var, style="TCheckbutton")
-            cb.pack(anchor="w", pady=5)
+        self.visible_option_count = 0
 
         # 导航按钮区域
         self.create_navigation_buttons()
+
+    def display_question(self):
+        """显示当前题目和选项"""
+        # 获取当前题目数据
+        question_data = self.quiz_questions[self.current_question_index]
+        stem = question_data.stem
+        options = question_data.options
+
+        self.progress_label.configure(text=f"题目 {self.current_question_index + 1} / {len(self.quiz_questions)}")
+        self.stem_label.configure(text=stem)
+
+        while len(self.option_pool) < len(options):
+            var = tk.BooleanVar()
+            cb = ttk.Checkbutton(self.options_frame, variable=var, style="TCheckbutton")
+            self.option_pool.append((cb, var))
+
+        # 检查之前是否已保存答案
+        saved_answers = self.user_answers.get(self.current_question_index, {})
+        for i, option_text in enumerate(options):
+            cb, var = self.option_pool[i]
+            cb.configure(text=option_text)
+            var.set(saved_answers.get(i, False))
+        # 隐藏的复选框总在末尾，按顺序显示/隐藏即可保持选项顺序
+        for cb, _ in self.option_pool[self.visible_option_count:len(options)]:
+            cb.pack(anchor="w", pady=5)
+        for cb, var in self.option_pool[len(options):self.visible_option_count]:
+            cb.pack_forget()
+            var.set(False)
+        self.visible_option_count = len(options)
+        self.option_vars = [var for _, var in self.option_pool[:len(options)]]
+
+        # 导航按钮状态
+        self.update_navigation_buttons()
     
     def create_navigation_buttons(self):
         """创建上一题、下一题、提交按钮"""
@@ -129,19 +256,21 @@ class QuizApp:
         nav_frame.pack(side="bottom", fill="x")
 
         # 上一题按钮
-        prev_button = ttk.Button(nav_frame, text="上一题", command=self.prev_question)
-        if self.current_question_index == 0:
-            prev_button.state(['disabled'])
-        prev_button.pack(side="left")
-
-        # 提交按钮（仅在最后一题显示）
-        if self.current_question_index == len(self.quiz_questions) - 1:
-            submit_button = ttk.Button(nav_frame, text="提交问卷", command=self.submit_quiz)
-            submit_button.pack(side="right")
-        else:
-            # 下一题按钮
-            next_button = ttk.Button(nav_frame, text="下一题", command=self.next_question)
-            next_button.pack(side="right")
+        self.prev_button = ttk.Button(nav_frame, text="上一题", command=self.prev_question)
+        self.prev_button.pack(side="left")
+
+        # 下一题按钮与提交按钮（仅在最后一题显示）共用右侧位置
+        self.next_button = ttk.Button(nav_frame, text="下一题", command=self.next_question)
+        self.submit_button = ttk.Button(nav_frame, text="提交问卷", command=self.submit_quiz)
+
+    def update_navigation_buttons(self):
+        """根据当前题目位置更新导航按钮"""
+        self.prev_button.state(['disabled'] if self.current_question_index == 0 else ['!disabled'])
+        is_last = self.current_question_index == len(self.quiz_questions) - 1
+        show, hide = (self.submit_button, self.next_button) if is_last else (self.next_button, self.submit_button)
+        hide.pack_forget()
+        if not show.winfo_manager():
+            show.pack(side="right")
 
     def save_current_answer(self):
         """保存当前题目的作答情况"""
@@ -167,13 +296,10 @@ class QuizApp:
         """提交问卷并计算分数"""
         self.save_current_answer()
         
-        score = 0
-        for i, question_data in enumerate(self.quiz_questions):
-            correct_options = {idx for idx, opt in enumerate(question_data["options"]) if opt[1]}
-            user_selected_options = set(self.user_answers.get(i, {}).keys())
-            
-            if correct_options == user_selected_options:
-                score += 1
+        self.result_correct = [question_data.check(self.user_answers.get(i, {}))
+                               for i, question_data in enumerate(self.quiz_questions)]
+        score = sum(self.result_correct)
+        self.record_history()
         
         total_questions = len(self.quiz_questions)
         result_title = "测验完成！"
@@ -183,57 +309,177 @@ class QuizApp:
         self.show_results()
 
     def show_results(self):
-        """在主窗口展示详细作答结果"""
+        """
+        在主窗口展示详细作答结果。
+
+        列表是虚拟化的：只为当前可见的行创建组件，滚动时复用这些行并填入新的题目，
+        题目再多也能立即打开。每行先按预估高度占位，首次显示时按完整内容量出实际高度，
+        长题干和长选项不会被截断。
+        """
         self.clear_frame()
 
-        # 创建一个带滚动条的Canvas
-        canvas = tk.Canvas(self.root)
-        scrollbar = ttk.Scrollbar(self.root, orient="vertical", command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas)
+        # 顶部标题与筛选
+        header_frame = ttk.Frame(self.root, padding=(10, 10, 10, 0))
+        header_frame.pack(fill="x")
+        ttk.Label(header_frame, text="答题详情回顾", style="Header.TLabel").pack(side="left")
+        self.only_wrong_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(header_frame, text="只看错题", variable=self.only_wrong_var,
+                        command=self.apply_result_filter).pack(side="right")
+        self.result_summary_label = ttk.Label(header_frame)
+        self.result_summary_label.pack(side="right", padx=10)
 
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(
-                scrollregion=canvas.bbox("all")
-            )
-        )
+        # 带滚动条的Canvas，行组件以窗口项的形式放在Canvas上
+        self.results_canvas = tk.Canvas(self.root, highlightthickness=0, yscrollincrement=20)
+        self.results_scrollbar = ttk.Scrollbar(self.root, orient="vertical", command=self.results_canvas.yview)
+        self.results_canvas.configure(yscrollcommand=self.on_results_scroll)
+        self.results_canvas.bind("<Configure>", self.on_results_resize)
+        self.bind_result_wheel(self.results_canvas)
 
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
+        self.results_canvas.pack(side="left", fill="both", expand=True)
+        self.results_scrollbar.pack(side="right", fill="y")
 
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
-        ttk.Label(scrollable_frame, text="答题详情回顾", style="Header.TLabel").pack(pady=10)
-
-        for i, q_data in enumerate(self.quiz_questions):
-            result_frame = ttk.Frame(scrollable_frame, padding=10, relief="groove", borderwidth=2)
-            result_frame.pack(padx=10, pady=5, fill="x")
-            
-            # 判断对错
-            correct_opts_set = {idx for idx, opt in enumerate(q_data["options"]) if opt[1]}
-            user_opts_set = set(self.user_answers.get(i, {}).keys())
-            is_correct = (correct_opts_set == user_opts_set)
-            
-            result_text = "正确" if is_correct else "错误"
-            result_color = "green" if is_correct else "red"
-            
-            # 题干
-            header = f"题目 {i+1}: ({result_text})"
-            ttk.Label(result_frame, text=header, foreground=result_color, font=("Helvetica", 13, "bold")).pack(anchor="w")
-            ttk.Label(result_frame, text=q_data['stem'], wraplength=700, justify=tk.LEFT).pack(anchor="w", pady=(5,10))
-
-            # 你的答案
-            user_ans_texts = [q_data['options'][idx][0] for idx in user_opts_set]
-            if not user_ans_texts: user_ans_texts.append("未作答")
-            ttk.Label(result_frame, text=f"你的答案: {', '.join(user_ans_texts)}", foreground="blue").pack(anchor="w")
-            
-            # 正确答案
-            correct_ans_texts = [q_data['options'][idx][0] for idx in correct_opts_set]
-            ttk.Label(result_frame, text=f"正确答案: {', '.join(correct_ans_texts)}", foreground="green").pack(anchor="w")
+        self.result_rows = []  # 行组件池
+        self.result_heights = [RESULT_ROW_HEIGHT] * len(self.quiz_questions)  # 各题行高，显示后更新为实测值
+        self.result_wraplength = 700
+        self.result_layout_busy = False
+        self.apply_result_filter()
+
+    def apply_result_filter(self):
+        """根据“只看错题”筛选要显示的题目，并回到列表顶部"""
+        if self.only_wrong_var.get():
+            self.result_indices = [i for i, ok in enumerate(self.result_correct) if not ok]
+        else:
+            self.result_indices = range(len(self.quiz_questions))
+
+        wrong_count = len(self.result_correct) - sum(self.result_correct)
+        self.result_summary_label.configure(
+            text=f"共 {len(self.quiz_questions)} 题，错 {wrong_count} 题，当前显示 {len(self.result_indices)} 题")
+
+        for row in self.result_rows:
+            row["index"] = None  # 内容需重新填充
+        self.update_result_offsets()
+        self.results_canvas.yview_moveto(0)
+        self.layout_result_rows()
+
+    def update_result_offsets(self):
+        """按各行当前的高度计算每行的起始位置，并更新滚动范围"""
+        self.result_offsets = [0, *itertools.accumulate(self.result_heights[i] for i in self.result_indices)]
+        self.results_canvas.configure(scrollregion=(0, 0, 0, self.result_offsets[-1]))
+
+    def on_results_resize(self, event):
+        """窗口宽度变化时调整换行宽度；行高随之变化，可见的行重新填充并测量"""
+        wraplength = max(event.width - 40, 100)
+        if wraplength != self.result_wraplength:
+            self.result_wraplength = wraplength
+            for row in self.result_rows:
+                for key in ("stem", "user", "correct"):
+                    row[key].configure(wraplength=wraplength)
+                row["index"] = None
+        self.layout_result_rows()
+
+    def on_results_scroll(self, first, last):
+        """Canvas 视图变化时同步滚动条，并重新摆放可见的行"""
+        self.results_scrollbar.set(first, last)
+        self.layout_result_rows()
+
+    def bind_result_wheel(self, widget):
+        """让鼠标滚轮在结果列表的任意位置都能滚动"""
+        widget.bind("<MouseWheel>", lambda e: self.results_canvas.yview_scroll(-3 if e.delta > 0 else 3, "units"))
+        widget.bind("<Button-4>", lambda e: self.results_canvas.yview_scroll(-3, "units"))
+        widget.bind("<Button-5>", lambda e: self.results_canvas.yview_scroll(3, "units"))
+
+    def create_result_row(self):
+        """创建一行结果组件（加入行组件池后反复复用）"""
+        # 行高由内容决定
+        frame = ttk.Frame(self.results_canvas, padding=10, relief="groove", borderwidth=2)
+        wraplength = self.result_wraplength
+        row = {
+            "frame": frame,
+            "window": self.results_canvas.create_window(0, 0, window=frame, anchor="nw", state="hidden"),
+            "header": ttk.Label(frame, font=("Helvetica", 13, "bold")),
+            "stem": ttk.Label(frame, wraplength=wraplength, justify=tk.LEFT),
+            "user": ttk.Label(frame, foreground="blue", wraplength=wraplength, justify=tk.LEFT),
+            "correct": ttk.Label(frame, foreground="green", wraplength=wraplength, justify=tk.LEFT),
+            "index": None,
+        }
+        row["header"].pack(anchor="w")
+        row["stem"].pack(anchor="w", pady=(5, 10))
+        row["user"].pack(anchor="w")
+        row["correct"].pack(anchor="w")
+        for widget in (frame, row["header"], row["stem"], row["user"], row["correct"]):
+            self.bind_result_wheel(widget)
+        return row
+
+    def fill_result_row(self, row, i):
+        """把第 i 题的作答结果填入一行，返回该行是否与记录的高度不同"""
+        q_data = self.quiz_questions[i]
+        user_opts = sorted(self.user_answers.get(i, {}))
+        is_correct = self.result_correct[i]
+
+        result_text = "正确" if is_correct else "错误"
+        result_color = "green" if is_correct else "red"
+        row["header"].configure(text=f"题目 {i+1}: ({result_text})", foreground=result_color)
+        row["stem"].configure(text=q_data.stem)
+
+        # 你的答案
+        user_ans_texts = [q_data.options[idx] for idx in user_opts]
+        if not user_ans_texts: user_ans_texts.append("未作答")
+        row["user"].configure(text=f"你的答案: {', '.join(user_ans_texts)}")
+
+        # 正确答案
+        correct_ans_texts = [q_data.options[idx] for idx in q_data.correct_indices]
+        row["correct"].configure(text=f"正确答案: {', '.join(correct_ans_texts)}")
+        row["index"] = i
+
+        # 按完整内容量出行高（含行间距）
+        row["frame"].update_idletasks()
+        height = row["frame"].winfo_reqheight() + RESULT_ROW_GAP
+        changed = height != self.result_heights[i]
+        self.result_heights[i] = height
+        return changed
+
+    def layout_result_rows(self):
+        """只为可见范围内的题目摆放行组件，其余的行隐藏"""
+        # 测量行高时会处理空闲事件，期间触发的滚动回调不再重入
+        if self.result_layout_busy:
+            return
+        self.result_layout_busy = True
+        try:
+            top = self.place_result_rows()
+        finally:
+            self.result_layout_busy = False
+        # 行高变化使滚动范围缩小时视图可能已被移动，按新位置再摆放一次
+        if self.results_canvas.canvasy(0) != top:
+            self.layout_result_rows()
+
+    def place_result_rows(self):
+        """摆放可见的行，返回摆放时视图顶部的位置"""
+        canvas = self.results_canvas
+        top = canvas.canvasy(0)
+        bottom = top + canvas.winfo_height()
+        position = max(0, bisect.bisect_right(self.result_offsets, top) - 1)
+
+        width = max(canvas.winfo_width() - 10, 1)
+        slot = 0
+        while position < len(self.result_indices) and self.result_offsets[position] < bottom:
+            if slot == len(self.result_rows):
+                self.result_rows.append(self.create_result_row())
+            row = self.result_rows[slot]
+            i = self.result_indices[position]
+            # 实测高度与预估不同时，其后各行的位置随之移动
+            if row["index"] != i and self.fill_result_row(row, i):
+                self.update_result_offsets()
+            canvas.coords(row["window"], 5, self.result_offsets[position] + 5)
+            canvas.itemconfigure(row["window"], width=width, state="normal")
+            slot += 1
+            position += 1
+
+        for row in self.result_rows[slot:]:
+            canvas.itemconfigure(row["window"], state="hidden")
+        return top
 
 
 if __name__ == "__main__":
     root = tk.Tk()
-    app = QuizApp(root)
+    app = QuizApp(root, sys.argv[1] if len(sys.argv) > 1 else "题库.json")
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,98 @@
+"""bank_store 各存储后端的回归测试：写入中断后的恢复、事务回滚、文件权限与 .xqb 校验。"""
+import os
+import stat
+
+import pytest
+
+from bank_store import BankFormatError, CompiledBank, write_compiled_bank
+
+QUESTIONS = [
+    {"type": "单选题", "stem": "题目一", "options": [["甲", True], ["乙", False]]},
+    {"type": "多选题", "stem": "题目二", "options": [["丙", True], ["丁", True], ["戊", False]]},
+]
+
+
+def test_truncated_compiled_bank_is_rejected(tmp_path):
+    path = tmp_path / "题库.xqb"
+    write_compiled_bank(str(path), QUESTIONS)
+    data = path.read_bytes()
+    assert [dict(q) for q in CompiledBank(str(path))] == QUESTIONS
+
+    for size in (len(data) - 1, len(data) // 2, 24):
+        path.write_bytes(data[:size])
+        with pytest.raises(BankFormatError):
+            CompiledBank(str(path))
+
+
+def test_compiled_store_releases_mapping_before_replace(tmp_path):
+    from bank_store import CompiledBankStore
+    from question_model import QuestionBank
+
+    path = str(tmp_path / "题库.xqb")
+    write_compiled_bank(path, QUESTIONS)
+    store = CompiledBankStore(path)
+    source = store.load()
+    bank = QuestionBank.from_dicts(source)
+    new = {"type": "单选题", "stem": "题目三", "options": [["己", False], ["庚", True]]}
+    store.upsert([new])
+
+    # 替换文件前映射已关闭（Windows 上替换被映射的文件会失败），已加载的题库仍可访问
+    assert isinstance(source._mm, bytes)
+    assert bank.to_dicts() == QUESTIONS
+    assert [dict(q) for q in CompiledBankStore(path).load()] == QUESTIONS + [new]
+
+
+def test_jsonl_torn_tail_is_truncated_before_append(tmp_path):
+    from bank_store import JsonlBankStore
+
+    path = tmp_path / "题库.jsonl"
+    JsonlBankStore(str(path)).replace_all(QUESTIONS[:1])
+    # 写入中断：半行截断在多字节字符中间
+    with open(path, 'ab') as f:
+        f.write('{"type": "单选题", "stem": "半行'.encode('utf-8')[:-1])
+
+    store = JsonlBankStore(str(path))
+    assert store.load() == QUESTIONS[:1]
+    store.upsert(QUESTIONS[1:])
+    assert JsonlBankStore(str(path)).load() == QUESTIONS
+    assert path.read_bytes().endswith(b'\n')
+
+
+def test_jsonl_last_line_without_newline_is_kept(tmp_path):
+    from bank_store import JsonlBankStore
+
+    path = tmp_path / "题库.jsonl"
+    JsonlBankStore(str(path)).replace_all(QUESTIONS[:1])
+    path.write_bytes(path.read_bytes().rstrip(b'\n'))
+
+    JsonlBankStore(str(path)).upsert(QUESTIONS[1:])
+    assert JsonlBankStore(str(path)).load() == QUESTIONS
+
+
+def test_sqlite_replace_all_rolls_back_on_failure(tmp_path):
+    from bank_store import SqliteBankStore
+
+    store = SqliteBankStore(str(tmp_path / "题库.sqlite"))
+    try:
+        store.replace_all(QUESTIONS)
+        with pytest.raises(KeyError):
+            store.replace_all([QUESTIONS[0], {"stem": "缺少题型"}])
+        assert store.load() == QUESTIONS
+    finally:
+        store.close()
+
+
+@pytest.mark.skipif(os.name != 'posix', reason="只在 POSIX 上检查文件权限位")
+def test_atomic_write_keeps_file_mode(tmp_path):
+    from bank_store import JsonBankStore
+
+    path = tmp_path / "题库.json"
+    store = JsonBankStore(str(path))
+    store.replace_all(QUESTIONS)
+    umask = os.umask(0)
+    os.umask(umask)
+    assert stat.S_IMODE(path.stat().st_mode) == 0o666 & ~umask
+
+    path.chmod(0o640)
+    store.replace_all(QUESTIONS[:1])
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
@@ -0,0 +1,55 @@
+"""changelog 变更日志的回归测试：写入中断留下的半行与日志中间的损坏。"""
+import json
+
+import pytest
+
+from bank_store import BankFormatError
+from changelog import ChangeLog, changes_path
+
+
+def _entries(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_torn_tail_is_truncated_before_append(tmp_path):
+    path = changes_path(str(tmp_path / "题库.json"))
+    ChangeLog(path).record(None, [("a", "fp-a"), ("b", "fp-b")])
+    with open(path, 'ab') as f:
+        f.write(b'{"seq": 3, "time": 0, "id": "c", "op"')
+
+    log = ChangeLog(path)
+    assert log.changed_since(("seq", 0)) == {"a", "b"}
+    assert log.head_seq == 2
+    assert log.record(None, [("c", "fp-c")]) == 1
+
+    # 半行被截掉，新记录接在完整的行之后，之后的加载能看到全部记录
+    entries = _entries(path)
+    assert [entry['seq'] for entry in entries] == [1, 2, 3]
+    log = ChangeLog(path)
+    assert log.record(None, [("d", "fp-d")]) == 1
+    assert [entry['seq'] for entry in _entries(path)] == [1, 2, 3, 4]
+    assert ChangeLog(path).changed_since(("seq", 2)) == {"c", "d"}
+
+
+def test_last_line_without_newline_is_kept(tmp_path):
+    path = changes_path(str(tmp_path / "题库.json"))
+    ChangeLog(path).record(None, [("a", "fp-a")])
+    with open(path, 'rb+') as f:
+        f.truncate(len(f.read()) - 1)
+
+    ChangeLog(path).record(None, [("b", "fp-b")])
+    assert [entry['id'] for entry in _entries(path)] == ["a", "b"]
+
+
+def test_corruption_in_the_middle_raises(tmp_path):
+    path = changes_path(str(tmp_path / "题库.json"))
+    ChangeLog(path).record(None, [("a", "fp-a"), ("b", "fp-b")])
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+    lines[0] = "not json\n"
+    with open(path, 'w', encoding='utf-8') as f:
+        f.writelines(lines)
+
+    with pytest.raises(BankFormatError):
+        ChangeLog(path).record(None, [("c", "fp-c")])
@@ -0,0 +1,66 @@
+"""
+page_parser 离线解析的回归测试。
+
+fixtures/review_page.html 是按超星作业详情页结构保存的测试页面，覆盖：
+选项中嵌套的 <p>、<br> 换行、HTML 实体、没有 mark_key（未公布答案）的题目、
+缺少题型标记的题目，以及 <script> 中形似题目的字符串。
+"""
+import os
+
+import pytest
+
+from page_parser import extract_questions, parse_html_file
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "review_page.html")
+
+
+@pytest.fixture(scope="module")
+def parsed():
+    with open(FIXTURE, 'r', encoding='utf-8') as f:
+        return extract_questions(f.read())
+
+
+def test_counts_and_errors(parsed):
+    questions, errors, found_count = parsed
+    # <script> 中的字符串不算题目；缺少题型标记的一题解析失败但不影响其他题目
+    assert found_count == 4
+    assert len(questions) == 3
+    assert errors == ["解析某道题目时出错: 找不到元素 h3.mark_name > span.colorShallow"]
+
+
+def test_single_choice(parsed):
+    question = parsed[0][0]
+    assert question["type"] == "单选题"
+    # 题干取 textContent，&nbsp; 保留为 \xa0，与 Selenium 版本一致
+    assert question["stem"] == "必须坚持(\xa0\xa0 )的社会治理理念。"
+    assert question["options"] == [
+        ("科学　实效", False),
+        ("共建共治共享", True),
+        ("依法 治理", False),
+    ]
+
+
+def test_multiple_choice_nested_p_and_br(parsed):
+    question = parsed[0][1]
+    assert question["type"] == "多选题"
+    # 题干中的 <br> 不产生文本
+    assert question["stem"] == "下列说法正确的有（多选）"
+    assert question["options"] == [
+        ("第一段\n嵌套的第二段", True),
+        ("上一行\n下一行", True),
+        ("<标签> & 实体", True),
+        ("错误选项", False),
+    ]
+
+
+def test_missing_mark_key(parsed):
+    question = parsed[0][2]
+    assert question["type"] == "判断题"
+    assert question["stem"] == "未公布答案的题目"
+    assert question["options"] == [("对", False), ("错", False)]
+
+
+def test_parse_html_file_matches_extract(parsed):
+    path, questions, errors, found_count = parse_html_file(FIXTURE)
+    assert path == FIXTURE
+    assert (questions, errors, found_count) == parsed
@@ -0,0 +1,50 @@
+"""practice.WeightedSampler（树状数组加权抽样）的测试。"""
+import random
+from collections import Counter
+
+from practice import WeightedSampler
+
+
+def test_sample_without_replacement():
+    sampler = WeightedSampler([1.0, 2.0, 3.0, 4.0, 5.0])
+    rng = random.Random(0)
+    for _ in range(200):
+        chosen = sampler.sample(3, rng)
+        assert len(chosen) == len(set(chosen)) == 3
+    # 抽样后权重恢复原值
+    assert [sampler.weight(i) for i in range(5)] == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert sampler.total() == 15.0
+
+
+def test_sample_follows_weights_and_skips_zero():
+    sampler = WeightedSampler([0.0, 1.0, 9.0])
+    rng = random.Random(1)
+    counts = Counter(sampler.sample(1, rng)[0] for _ in range(2000))
+    assert counts[0] == 0
+    assert 0.85 < counts[2] / 2000 < 0.95
+    # 非零权重的项不足 k 个时返回的数量少于 k
+    assert sorted(sampler.sample(3, rng)) == [1, 2]
+
+
+def test_update():
+    sampler = WeightedSampler([1.0, 1.0, 1.0])
+    sampler.update(1, 0.0)
+    sampler.update(2, 5.0)
+    assert sampler.weight(2) == 5.0
+    assert sampler.total() == 6.0
+    rng = random.Random(2)
+    assert all(sampler.sample(1, rng) != [1] for _ in range(200))
+    assert sorted(sampler.sample(5, rng)) == [0, 2]
+
+
+def test_empty_and_single():
+    empty = WeightedSampler([])
+    assert len(empty) == 0
+    assert empty.total() == 0.0
+    assert empty.sample(3) == []
+
+    single = WeightedSampler([2.5])
+    assert single.sample(1) == [0]
+    assert single.sample(4) == [0]
+    single.update(0, 0.0)
+    assert single.sample(1) == []
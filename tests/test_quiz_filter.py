@@ -0,0 +1,74 @@
+"""quiz_filter.QuizFilterIndex（测验抽题筛选）的测试。"""
+import random
+
+import pytest
+
+from normalize import normalize_stem, normalize_stems
+from quiz_filter import QuizFilterIndex
+
+STEMS = [
+    "必须坚持共建共治共享的社会治理理念。",
+    "社会治理体系的核心是()。",
+    "下列属于社会主义核心价值观的有（多选）",
+    "治理",
+    "会",
+    "",
+    "会会会社",
+]
+
+
+class _History:
+    def __init__(self, records):
+        self.records = records
+
+    def get(self, key):
+        return self.records.get(key)
+
+
+@pytest.fixture(scope="module")
+def index():
+    keys = normalize_stems(STEMS)
+    types = ["单选题", "单选题", "多选题", "判断题", "判断题", "单选题", "多选题"]
+    history = _History({keys[1]: [3, 1], keys[2]: [2, 0]})
+    return keys, QuizFilterIndex(types, keys, history)
+
+
+@pytest.mark.parametrize("keyword", ["社会治理", "治理", "社", "会", "会社", "会会", "()", "核心", "不存在", "理念。"])
+def test_keyword_matches_substring_search(index, keyword):
+    keys, quiz_index = index
+    needle = normalize_stem(keyword)
+    assert list(quiz_index.keyword_indices(keyword)) == [i for i, key in enumerate(keys) if needle in key]
+
+
+def test_bigrams_present_but_not_adjacent(index):
+    _, quiz_index = index
+    # "社会" 和 "会治" 分别出现，但 "社会治" 只出现在连续的位置上
+    assert list(quiz_index.keyword_indices("社会治")) == [0, 1]
+    assert list(quiz_index.keyword_indices("会社会")) == []
+
+
+def test_empty_keyword_and_combined_filters(index):
+    keys, quiz_index = index
+    assert list(quiz_index.keyword_indices("  ")) == list(range(len(keys)))
+    assert list(quiz_index.select()) == list(range(len(keys)))
+    assert quiz_index.select(q_type="单选题", keyword="治理") == [0, 1]
+    assert quiz_index.select(keyword="治理", only_wrong=True) == [1]
+    quiz_index.mark_wrong(3)
+    assert quiz_index.select(q_type="判断题", keyword="治理", only_wrong=True) == [3]
+
+
+def test_random_bank_matches_substring_search():
+    rng = random.Random(0)
+    keys = ["".join(rng.choice("甲乙丙丁ab") for _ in range(rng.randrange(0, 12))) for _ in range(300)]
+    quiz_index = QuizFilterIndex(["单选题"] * len(keys), keys)
+    for _ in range(200):
+        needle = "".join(rng.choice("甲乙丙丁ab") for _ in range(rng.randrange(1, 5)))
+        expected = [i for i, key in enumerate(keys) if needle in key]
+        assert list(quiz_index.keyword_indices(needle)) == expected
+
+
+def test_empty_bank():
+    quiz_index = QuizFilterIndex([], [])
+    assert list(quiz_index.keyword_indices("社会")) == []
+    assert list(quiz_index.keyword_indices("社")) == []
+    assert list(quiz_index.select()) == []
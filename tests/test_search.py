@@ -0,0 +1,27 @@
+"""search 全文检索的回归测试。"""
+from question_model import Question, QuestionBank
+from search import SearchIndex
+
+
+def _bank(stems):
+    return QuestionBank(Question("单选题", stem, ["甲", "乙"], 1) for stem in stems)
+
+
+def test_single_character_score_at_most_one():
+    index = SearchIndex()
+    index.sync(_bank(["治理治国治学治本", "政治", "无关题目"]))
+    results = index.search("治")
+    assert {stem for _, stem in results} == {"治理治国治学治本", "政治"}
+    assert all(score == 1.0 for score, _ in results)
+
+
+def test_incremental_sync_matches_full_build():
+    stems = [f"第{i}题社会治理体系{i % 7}" for i in range(50)]
+    full = SearchIndex()
+    full.sync(_bank(stems))
+    incremental = SearchIndex()
+    for end in (10, 30, 50):
+        incremental.sync(_bank(stems[:end]))
+    assert full.grams.tolist() == incremental.grams.tolist()
+    assert full.doc_ids.tolist() == incremental.doc_ids.tolist()
+    assert full.search("治理", 5) == incremental.search("治理", 5)
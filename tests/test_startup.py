@@ -0,0 +1,42 @@
+"""
+离线模式的启动开销测试：复用 benchmarks/check_startup.py 的模式表，
+在子进程中以 -X importtime 运行 main.py，确认没有加载浏览器相关依赖和 pandas，
+且导入耗时在一个宽松的预算内（CI 机器较慢，预算为该脚本默认值的数倍）。
+"""
+import importlib.util
+import json
+import os
+import sys
+
+import pytest
+
+BENCHMARKS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks")
+sys.path.insert(0, BENCHMARKS_DIR)
+import check_startup  # noqa: E402
+
+BUDGET_MS = 5 * check_startup.DEFAULT_BUDGET_MS
+
+
+@pytest.fixture(scope="module")
+def db_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("startup") / "bank.json"
+    path.write_text(json.dumps(check_startup.SAMPLE_BANK, ensure_ascii=False), encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("name, args, required, forbidden", check_startup.MODES,
+                         ids=[mode[0] for mode in check_startup.MODES])
+def test_offline_mode_imports(name, args, required, forbidden, db_path):
+    for module in required:
+        if importlib.util.find_spec(module) is None:
+            pytest.skip(f"缺少依赖 {module}")
+    returncode, (total_us, modules) = check_startup.run_mode(args, os.path.dirname(db_path), db_path)
+    assert returncode == 0
+
+    for module in ("selenium", "webdriver_manager", "pandas"):
+        assert module not in modules
+    loaded = sorted(m for m in forbidden if m in modules)
+    assert not loaded, f"{name} 加载了 {', '.join(loaded)}"
+
+    own_ms = (total_us - sum(modules.get(m, 0) for m in required)) / 1000
+    assert own_ms < BUDGET_MS